@@ -0,0 +1,43 @@
+"""lowercase_user_email_username
+
+Revision ID: 1a7e3c5d9f20
+Revises: f5c0d3a8b741
+Create Date: 2026-10-15 23:58:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a7e3c5d9f20'
+down_revision: Union[str, None] = 'f5c0d3a8b741'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lookups compare against the stored value directly, so every row must
+    # already be lowercase. This fails on the unique indexes if two accounts
+    # differ only by case; those have to be merged by hand first.
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email);")
+    op.execute("UPDATE users SET username = lower(username) WHERE username <> lower(username);")
+
+    # Add unvalidated, then validate: the scan does not block writes
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_email_lowercase "
+        "CHECK (email = lower(email)) NOT VALID;"
+    )
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_username_lowercase "
+        "CHECK (username = lower(username)) NOT VALID;"
+    )
+    op.execute("ALTER TABLE users VALIDATE CONSTRAINT ck_users_email_lowercase;")
+    op.execute("ALTER TABLE users VALIDATE CONSTRAINT ck_users_username_lowercase;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_username_lowercase;")
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_email_lowercase;")
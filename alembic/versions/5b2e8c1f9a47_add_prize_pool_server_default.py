@@ -0,0 +1,27 @@
+"""add_prize_pool_server_default
+
+Revision ID: 5b2e8c1f9a47
+Revises: e46442be6d10
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c1f9a47'
+down_revision: Union[str, None] = 'e46442be6d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # New competitions start with an empty prize pool that grows with entries
+    op.execute("ALTER TABLE competitions ALTER COLUMN prize_pool SET DEFAULT 0;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE competitions ALTER COLUMN prize_pool DROP DEFAULT;")
@@ -0,0 +1,61 @@
+"""add_submission_judging_stats
+
+Revision ID: 8f3a61c2d7b9
+Revises: 5b2e8c1f9a47
+Create Date: 2026-10-15 11:04:27.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a61c2d7b9'
+down_revision: Union[str, None] = '5b2e8c1f9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized judging stats so leaderboards don't join judge_assignments
+    op.execute("""
+        ALTER TABLE submissions
+            ADD COLUMN num_judges_assigned INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN num_judges_completed INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN human_scores_average DOUBLE PRECISION;
+    """)
+
+    # Backfill from existing assignments and scores
+    op.execute("""
+        UPDATE submissions s
+        SET num_judges_assigned = ja.assigned,
+            num_judges_completed = ja.completed
+        FROM (
+            SELECT submission_id, COUNT(*) AS assigned, COUNT(completed_at) AS completed
+            FROM judge_assignments
+            GROUP BY submission_id
+        ) ja
+        WHERE ja.submission_id = s.id;
+    """)
+    op.execute("""
+        UPDATE submissions
+        SET human_scores_average = (human_scores->>'average')::double precision
+        WHERE human_scores IS NOT NULL;
+    """)
+
+    op.execute(
+        "CREATE INDEX ix_submissions_competition_final_score "
+        "ON submissions (competition_id, final_score DESC NULLS LAST);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_submissions_competition_final_score;")
+    op.execute("""
+        ALTER TABLE submissions
+            DROP COLUMN human_scores_average,
+            DROP COLUMN num_judges_completed,
+            DROP COLUMN num_judges_assigned;
+    """)
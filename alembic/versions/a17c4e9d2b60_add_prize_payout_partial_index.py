@@ -0,0 +1,30 @@
+"""add_prize_payout_partial_index
+
+Revision ID: a17c4e9d2b60
+Revises: 8f3a61c2d7b9
+Create Date: 2026-10-15 12:21:09.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a17c4e9d2b60'
+down_revision: Union[str, None] = '8f3a61c2d7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covers the prize payout lookup per submission in /connect-accounts/payout-status
+    op.execute(
+        "CREATE INDEX ix_payments_prize_payout_submission "
+        "ON payments (submission_id) WHERE type = 'prize_payout';"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_payments_prize_payout_submission;")
@@ -0,0 +1,33 @@
+"""add_stripe_processed_events_table
+
+Revision ID: b3d9f0e6c215
+Revises: a17c4e9d2b60
+Create Date: 2026-10-15 14:37:52.116840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f0e6c215'
+down_revision: Union[str, None] = 'a17c4e9d2b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stripe event IDs already processed by the webhook (idempotency guard)
+    op.execute("""
+        CREATE TABLE stripe_processed_events (
+            event_id VARCHAR(255) PRIMARY KEY,
+            event_type VARCHAR(100) NOT NULL,
+            received_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now())
+        );
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS stripe_processed_events;")
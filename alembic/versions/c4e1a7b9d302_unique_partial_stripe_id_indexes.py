@@ -0,0 +1,54 @@
+"""unique_partial_stripe_id_indexes
+
+Revision ID: c4e1a7b9d302
+Revises: b3d9f0e6c215
+Create Date: 2026-10-15 15:02:41.530627
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7b9d302'
+down_revision: Union[str, None] = 'b3d9f0e6c215'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Webhook lookups by Stripe ID; unique so a PaymentIntent/Transfer maps to
+    # one payment, partial so the NULLs on the other payment type are skipped.
+    # CONCURRENTLY cannot run inside a transaction. A failed build (duplicate
+    # IDs) leaves an INVALID index, so drop any leftover before retrying.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_payments_stripe_payment_intent_id;")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY uq_payments_stripe_payment_intent_id "
+            "ON payments (stripe_payment_intent_id) WHERE stripe_payment_intent_id IS NOT NULL;"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_payments_stripe_transfer_id;")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY uq_payments_stripe_transfer_id "
+            "ON payments (stripe_transfer_id) WHERE stripe_transfer_id IS NOT NULL;"
+        )
+
+        # Superseded by the partial unique indexes above
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_payments_stripe_payment_intent_id;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_payments_stripe_transfer_id;")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_stripe_payment_intent_id "
+            "ON payments (stripe_payment_intent_id);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_stripe_transfer_id "
+            "ON payments (stripe_transfer_id);"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_payments_stripe_payment_intent_id;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_payments_stripe_transfer_id;")
@@ -0,0 +1,37 @@
+"""add_competition_fee_cents_columns
+
+Revision ID: d8a25f3c6e14
+Revises: c4e1a7b9d302
+Create Date: 2026-10-15 15:48:17.264019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a25f3c6e14'
+down_revision: Union[str, None] = 'c4e1a7b9d302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Entry fee and platform fee in integer cents, kept in sync by Postgres
+    op.execute("""
+        ALTER TABLE competitions
+        ADD COLUMN entry_fee_cents INTEGER
+            GENERATED ALWAYS AS (CAST(entry_fee * 100 AS INTEGER)) STORED,
+        ADD COLUMN platform_fee_cents INTEGER
+            GENERATED ALWAYS AS (CAST(ROUND(entry_fee * platform_fee_percentage) AS INTEGER)) STORED;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE competitions
+        DROP COLUMN IF EXISTS platform_fee_cents,
+        DROP COLUMN IF EXISTS entry_fee_cents;
+    """)
@@ -0,0 +1,27 @@
+"""add_payment_stripe_client_secret
+
+Revision ID: e2b7c94a1f58
+Revises: d8a25f3c6e14
+Create Date: 2026-10-15 16:20:33.918452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c94a1f58'
+down_revision: Union[str, None] = 'd8a25f3c6e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL; the API falls back to Stripe for those
+    op.execute("ALTER TABLE payments ADD COLUMN stripe_client_secret VARCHAR(255);")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE payments DROP COLUMN IF EXISTS stripe_client_secret;")
@@ -0,0 +1,37 @@
+"""unique_active_submission_per_user
+
+Revision ID: f5c0d3a8b741
+Revises: e2b7c94a1f58
+Create Date: 2026-10-15 23:41:07.218354
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c0d3a8b741'
+down_revision: Union[str, None] = 'e2b7c94a1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One active submission per user and competition; rejected and
+    # not-selected entries are history and may repeat. The build fails if
+    # existing rows already break this, and leaves an INVALID index behind,
+    # so drop any leftover before retrying.
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_submissions_user_competition_active;")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY uq_submissions_user_competition_active "
+            "ON submissions (user_id, competition_id) "
+            "WHERE status IN ('draft', 'pending_payment', 'submitted', 'under_review', 'winner');"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_submissions_user_competition_active;")
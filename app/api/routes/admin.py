@@ -24,6 +24,7 @@ from app.schemas.admin import (
 )
 from app.core.security import require_role, get_current_user_obj
 from app.services.email_service import send_winner_notification, send_participant_notification
+from app.services.judging_service import refresh_judging_counts
 import stripe
 from app.config import get_settings
 import logging
@@ -187,7 +188,11 @@ async def assign_judges_to_competition(
                 new_assignments.append(new_assignment)
                 db.add(new_assignment)
 
-    # 8. Commit all changes (deletions + new assignments) atomically
+    # 8. Update denormalized judge counters, then commit all changes atomically
+    await db.flush()
+    await refresh_judging_counts(
+        db, competition_submission_ids if replace else all_submission_ids
+    )
     await db.commit()
 
     # 9. Fetch all assignments for this competition with relationships loaded
@@ -355,7 +360,9 @@ async def reassign_judge(
     # 5. Delete old assignment
     await db.delete(old_assignment)
 
-    # 6. Commit changes
+    # 6. Update denormalized judge counters and commit changes
+    await db.flush()
+    await refresh_judging_counts(db, [new_assignment.submission_id])
     await db.commit()
     await db.refresh(new_assignment)
 
@@ -441,6 +448,7 @@ async def get_competition_leaderboard(
 
     # 3. Build submission data with judging stats
     submission_data = []
+    fully_judged_count = 0
     for submission in eligible_submissions:
         # Calculate judging stats
         num_judges_assigned = len(submission.judge_assignments)
@@ -452,6 +460,8 @@ async def get_competition_leaderboard(
             num_judges_assigned > 0 and
             num_judges_completed == num_judges_assigned
         )
+        if judging_complete:
+            fully_judged_count += 1
 
         # Extract human scores average
         human_scores_average = None
@@ -479,7 +489,6 @@ async def get_competition_leaderboard(
     entries = []
     current_rank = 1
     previous_score = None
-    fully_judged_count = sum(1 for data in submission_data if data["judging_complete"])
 
     for idx, data in enumerate(submission_data):
         submission = data["submission"]
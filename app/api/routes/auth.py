@@ -2,7 +2,7 @@ from datetime import timedelta, datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 import secrets
 import logging
 from app.database import get_db
@@ -28,9 +28,9 @@ async def login(
     if settings.debug:
         print(f"DEBUG: Login attempt with username/email: '{form_data.username}'")
 
-    # Try username first (case-insensitive)
+    # Try username first (case-insensitive; usernames are stored lowercase)
     result = await db.execute(
-        select(User).where(func.lower(User.username) == form_data.username.lower())
+        select(User).where(User.username == form_data.username.lower())
     )
     user = result.scalar_one_or_none()
     if settings.debug:
@@ -41,7 +41,7 @@ async def login(
         if settings.debug:
             print(f"DEBUG: Trying email lookup (case-insensitive)...")
         result = await db.execute(
-            select(User).where(func.lower(User.email) == form_data.username.lower())
+            select(User).where(User.email == form_data.username.lower())
         )
         user = result.scalar_one_or_none()
         if settings.debug:
@@ -103,9 +103,9 @@ async def request_password_reset(
 ):
     """Request a password reset email. Always returns success for security."""
 
-    # Find user by email (case-insensitive)
+    # Find user by email (case-insensitive; emails are stored lowercase)
     result = await db.execute(
-        select(User).where(func.lower(User.email) == request.email.lower())
+        select(User).where(User.email == request.email.lower())
     )
     user = result.scalar_one_or_none()
 
@@ -1,9 +1,8 @@
-from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, or_, and_, case
+from sqlalchemy.orm import selectinload, load_only
 from app.database import get_db
 from app.models.competition import Competition, CompetitionStatus
 from app.models.submission import Submission, SubmissionStatus
@@ -17,8 +16,9 @@ from app.schemas.competition import (
 from app.schemas.admin import CompetitionLeaderboard, LeaderboardEntry
 from app.core.security import require_role, get_current_user_obj
 from app.services.email_service import send_competition_announcement
-from app.core.s3_service import generate_presigned_url, s3_client, delete_file
+from app.core.s3_service import generate_image_url, s3_client, delete_file_async
 from app.config import get_settings
+import asyncio
 import logging
 import os
 
@@ -27,9 +27,37 @@ settings = get_settings()
 
 router = APIRouter()
 
+# Maximum number of announcement emails sent concurrently
+ANNOUNCEMENT_EMAIL_CONCURRENCY = 20
+
+
+async def _get_competition_or_404(
+    db: AsyncSession,
+    competition_id: int,
+    *,
+    load_creator: bool = False,
+) -> Competition:
+    """
+    Fetch a competition by primary key or raise 404.
+
+    Uses the session identity map, so repeated lookups within a request
+    do not issue additional SQL.
+    """
+    options = [selectinload(Competition.creator)] if load_creator else None
+    competition = await db.get(Competition, competition_id, options=options)
+
+    if not competition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Competition not found",
+        )
+
+    return competition
+
 
 @router.get("/", response_model=list[CompetitionListResponse])
 async def list_competitions(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
     status_filter: Optional[CompetitionStatus] = Query(None, alias="status", description="Filter by competition status"),
@@ -45,8 +73,31 @@ async def list_competitions(
     - **status**: Filter by competition status (optional)
     - **domain**: Filter by domain (optional)
     - **search**: Search in title and description (case-insensitive, optional)
+
+    Sets the `X-Has-Next` response header to "true" when more records are available.
     """
-    query = select(Competition).options(selectinload(Competition.creator))
+    # Only load the columns CompetitionListResponse needs; keep in sync with the schema
+    query = select(Competition).options(
+        load_only(
+            Competition.id,
+            Competition.title,
+            Competition.description,
+            Competition.domain,
+            Competition.entry_fee,
+            Competition.prize_pool,
+            Competition.platform_fee_percentage,
+            Competition.max_entries,
+            Competition.current_entries,
+            Competition.deadline,
+            Competition.open_date,
+            Competition.status,
+            Competition.created_by,
+            Competition.created_at,
+            Competition.image_key,
+            Competition.image_url,
+        ),
+        selectinload(Competition.creator).load_only(User.id, User.username, User.email),
+    )
 
     # Apply filters
     if status_filter is not None:
@@ -64,17 +115,22 @@ async def list_competitions(
             )
         )
 
-    # Apply ordering, pagination
-    query = query.order_by(Competition.created_at.desc()).offset(skip).limit(limit)
+    # Apply ordering (id breaks created_at ties, so pages don't overlap) and
+    # pagination (fetch one extra row to detect a next page)
+    query = query.order_by(Competition.created_at.desc(), Competition.id.desc()).offset(skip).limit(limit + 1)
 
     result = await db.execute(query)
     competitions = result.scalars().all()
 
-    # Generate fresh presigned URLs for all competitions with images
+    has_next = len(competitions) > limit
+    competitions = competitions[:limit]
+    response.headers["X-Has-Next"] = "true" if has_next else "false"
+
+    # Generate fresh signed URLs for all competitions with images
     for comp in competitions:
         if comp.image_key:
             try:
-                comp.image_url = generate_presigned_url(comp.image_key, expiration=604800)  # 7 days
+                comp.image_url = generate_image_url(comp.image_key, expiration=604800)  # 7 days
             except Exception as e:
                 logger.warning(f"Failed to generate presigned URL for competition {comp.id}: {e}")
                 comp.image_url = None
@@ -92,23 +148,12 @@ async def get_competition(
 
     Returns 404 if competition not found.
     """
-    result = await db.execute(
-        select(Competition)
-        .options(selectinload(Competition.creator))
-        .where(Competition.id == competition_id)
-    )
-    competition = result.scalar_one_or_none()
+    competition = await _get_competition_or_404(db, competition_id, load_creator=True)
 
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Competition not found",
-        )
-
-    # Generate fresh presigned URL if image exists
+    # Generate fresh signed URL if image exists
     if competition.image_key:
         try:
-            competition.image_url = generate_presigned_url(competition.image_key, expiration=604800)  # 7 days
+            competition.image_url = generate_image_url(competition.image_key, expiration=604800)  # 7 days
         except Exception as e:
             logger.warning(f"Failed to generate presigned URL for competition {competition.id}: {e}")
             competition.image_url = None
@@ -135,11 +180,10 @@ async def create_competition(
         description=competition_data.description,
         domain=competition_data.domain,
         entry_fee=competition_data.entry_fee,
-        prize_pool=0,
         platform_fee_percentage=competition_data.platform_fee_percentage,
         max_entries=competition_data.max_entries,
-        deadline=competition_data.deadline.replace(tzinfo=None),
-        open_date=competition_data.open_date.replace(tzinfo=None),
+        deadline=competition_data.deadline,
+        open_date=competition_data.open_date,
         judging_sla_days=competition_data.judging_sla_days,
         rubric=competition_data.rubric,
         prize_structure=competition_data.prize_structure,
@@ -175,18 +219,7 @@ async def update_competition(
     All fields are optional - only provided fields will be updated.
     """
     # Fetch competition
-    result = await db.execute(
-        select(Competition)
-        .options(selectinload(Competition.creator))
-        .where(Competition.id == competition_id)
-    )
-    competition = result.scalar_one_or_none()
-
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Competition not found",
-        )
+    competition = await _get_competition_or_404(db, competition_id, load_creator=True)
 
     # Special handling when completing a competition
     if competition_data.status == CompetitionStatus.COMPLETE:
@@ -233,8 +266,6 @@ async def update_competition(
     update_data = competition_data.model_dump(exclude_unset=True)
 
     for field, value in update_data.items():
-        if isinstance(value, datetime) and value.tzinfo is not None:
-            value = value.replace(tzinfo=None)
         setattr(competition, field, value)
 
     await db.commit()
@@ -254,26 +285,31 @@ async def update_competition(
             start_date = competition.open_date.strftime('%B %d, %Y') if competition.open_date else 'TBD'
             end_date = competition.deadline.strftime('%B %d, %Y') if competition.deadline else 'TBD'
 
-            # Send email to each founder
-            for founder in founders:
-                try:
-                    await send_competition_announcement(
-                        to_email=founder.email,
-                        username=founder.username,
-                        competition_id=competition.id,
-                        competition_title=competition.title,
-                        domain=competition.domain,
-                        description=competition.description,
-                        prize_pool=competition.prize_pool,
-                        entry_fee=competition.entry_fee,
-                        max_entries=competition.max_entries,
-                        start_date=start_date,
-                        end_date=end_date,
-                        frontend_url=settings.frontend_url
-                    )
-                except Exception as email_error:
-                    logger.error(f"Failed to send competition announcement to founder {founder.id}: {str(email_error)}")
-                    continue
+            # Send email to each founder, with bounded concurrency so the
+            # email provider isn't flooded
+            semaphore = asyncio.Semaphore(ANNOUNCEMENT_EMAIL_CONCURRENCY)
+
+            async def _send_announcement(founder: User) -> None:
+                async with semaphore:
+                    try:
+                        await send_competition_announcement(
+                            to_email=founder.email,
+                            username=founder.username,
+                            competition_id=competition.id,
+                            competition_title=competition.title,
+                            domain=competition.domain,
+                            description=competition.description,
+                            prize_pool=competition.prize_pool,
+                            entry_fee=competition.entry_fee,
+                            max_entries=competition.max_entries,
+                            start_date=start_date,
+                            end_date=end_date,
+                            frontend_url=settings.frontend_url
+                        )
+                    except Exception as email_error:
+                        logger.error(f"Failed to send competition announcement to founder {founder.id}: {str(email_error)}")
+
+            await asyncio.gather(*(_send_announcement(founder) for founder in founders))
 
             logger.info(f"Competition announcement emails sent for competition {competition.id} to {len(founders)} founders")
 
@@ -295,6 +331,8 @@ async def update_competition(
 @router.get("/{competition_id}/results", response_model=CompetitionLeaderboard)
 async def get_competition_results(
     competition_id: int,
+    skip: int = Query(0, ge=0, description="Number of leaderboard entries to skip"),
+    limit: int = Query(100, ge=1, le=100, description="Maximum number of leaderboard entries to return"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user_obj),
 ):
@@ -303,23 +341,17 @@ async def get_competition_results(
 
     Accessible by: All authenticated users
 
+    - **skip**: Number of leaderboard entries to skip (default: 0)
+    - **limit**: Maximum number of entries to return (default: 100, max: 100)
+
     Returns:
-    - Full leaderboard with rankings
+    - Paginated leaderboard with rankings (ranks are global, not per page)
     - Only shows completed competitions
     - Winner information and placements
     - Submission titles (usernames hidden for privacy)
     """
     # 1. Fetch competition
-    result = await db.execute(
-        select(Competition).where(Competition.id == competition_id)
-    )
-    competition = result.scalar_one_or_none()
-
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Competition {competition_id} not found",
-        )
+    competition = await _get_competition_or_404(db, competition_id)
 
     # 2. Only show results for COMPLETE competitions
     if competition.status != CompetitionStatus.COMPLETE:
@@ -328,146 +360,90 @@ async def get_competition_results(
             detail="Competition results are only available for completed competitions",
         )
 
-    # 3. Query eligible submissions with relationships
-    result = await db.execute(
-        select(Submission)
-        .where(
-            Submission.competition_id == competition_id,
-            Submission.status.in_([
-                SubmissionStatus.SUBMITTED,
-                SubmissionStatus.UNDER_REVIEW,
-                SubmissionStatus.WINNER,
-                SubmissionStatus.NOT_SELECTED,
-            ])
-        )
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.judge_assignments),
-        )
+    eligible_statuses = [
+        SubmissionStatus.SUBMITTED,
+        SubmissionStatus.UNDER_REVIEW,
+        SubmissionStatus.WINNER,
+        SubmissionStatus.NOT_SELECTED,
+    ]
+
+    # 3. Judging progress is denormalized onto the submission row
+    judging_complete = and_(
+        Submission.num_judges_assigned > 0,
+        Submission.num_judges_assigned == Submission.num_judges_completed,
     )
-    eligible_submissions = result.scalars().all()
-
-    # Count total submissions
-    total_result = await db.execute(
-        select(func.count(Submission.id)).where(
-            Submission.competition_id == competition_id
+    # Fully judged first (0), then incomplete (1)
+    completeness = case((judging_complete, 0), else_=1)
+    score_order = Submission.final_score.desc().nullslast()
+
+    # 4. Competition-wide counts (independent of the requested page)
+    totals_result = await db.execute(
+        select(
+            func.count(Submission.id),
+            func.count(Submission.id).filter(Submission.status.in_(eligible_statuses)),
+            func.count(Submission.id).filter(
+                Submission.status.in_(eligible_statuses), judging_complete
+            ),
         )
+        .where(Submission.competition_id == competition_id)
     )
-    total_submissions = total_result.scalar()
-
-    # 4. Build submission data with judging stats
-    submission_data = []
-    for submission in eligible_submissions:
-        # Calculate judging stats
-        num_judges_assigned = len(submission.judge_assignments)
-        num_judges_completed = sum(
-            1 for assignment in submission.judge_assignments
-            if assignment.completed_at is not None
-        )
-        judging_complete = (
-            num_judges_assigned > 0 and
-            num_judges_completed == num_judges_assigned
-        )
+    total_submissions, eligible_count, fully_judged_count = totals_result.one()
 
-        # Extract human scores average
-        human_scores_average = None
-        if submission.human_scores and isinstance(submission.human_scores, dict):
-            human_scores_average = submission.human_scores.get("average")
-
-        submission_data.append({
-            "submission": submission,
-            "num_judges_assigned": num_judges_assigned,
-            "num_judges_completed": num_judges_completed,
-            "judging_complete": judging_complete,
-            "human_scores_average": human_scores_average,
-        })
-
-    # 5. Sort: fully judged first (by score DESC), then incomplete (by submission ID)
-    submission_data.sort(
-        key=lambda x: (
-            not x["judging_complete"],
-            -x["submission"].final_score if x["submission"].final_score is not None else 0,
-            x["submission"].id
+    # 5. Fetch one page, sorted by the database: fully judged first (by score DESC),
+    # then incomplete, with submission ID as tie-breaker. Ranks and ties are
+    # computed over the whole leaderboard so they stay consistent across pages.
+    result = await db.execute(
+        select(
+            Submission,
+            func.rank().over(order_by=(completeness, score_order)).label("rank"),
+            func.count(Submission.id).over(
+                partition_by=(completeness, Submission.final_score)
+            ).label("score_peers"),
         )
+        .where(
+            Submission.competition_id == competition_id,
+            Submission.status.in_(eligible_statuses),
+        )
+        .options(selectinload(Submission.user))
+        .order_by(completeness, score_order, Submission.id)
+        .offset(skip)
+        .limit(limit)
     )
+    rows = result.all()
 
-    # 6. Assign ranks and detect ties
+    # 6. Build entries for this page
     entries = []
-    current_rank = 1
-    previous_score = None
-    fully_judged_count = sum(1 for data in submission_data if data["judging_complete"])
-
-    for idx, data in enumerate(submission_data):
-        submission = data["submission"]
-        score = submission.final_score
-
-        # Only assign ranks to scored submissions
-        if score is not None:
-            # Check for tie
-            has_tie = False
-            if previous_score is not None and score == previous_score:
-                has_tie = True
-            else:
-                if idx > 0 and previous_score is not None:
-                    current_rank = idx + 1
-
-            # Mark previous entry as tied too if scores match
-            if has_tie and entries:
-                entries[-1].has_tie = True
-
-            # Generate presigned URL for avatar if available
-            avatar_url = None
-            if submission.user and submission.user.avatar_url:
-                try:
-                    avatar_url = generate_presigned_url(submission.user.avatar_url, expiration=86400)  # 24 hours
-                except Exception as e:
-                    logger.warning(f"Failed to generate presigned URL for avatar: {e}")
-                    avatar_url = None
-
-            entry = LeaderboardEntry(
-                rank=current_rank,
-                submission_id=submission.id,
-                title=submission.title,
-                user_id=submission.user_id,
-                username=submission.user.username if submission.user else "Unknown",
-                avatar_url=avatar_url,
-                final_score=submission.final_score,
-                human_scores_average=data["human_scores_average"],
-                num_judges_assigned=data["num_judges_assigned"],
-                num_judges_completed=data["num_judges_completed"],
-                judging_complete=data["judging_complete"],
-                has_tie=has_tie,
-                is_public=submission.is_public,
-            )
-            entries.append(entry)
-            previous_score = score
-        else:
-            # Unscored submission - no rank
-            # Generate presigned URL for avatar if available
-            avatar_url = None
-            if submission.user and submission.user.avatar_url:
-                try:
-                    avatar_url = generate_presigned_url(submission.user.avatar_url, expiration=86400)  # 24 hours
-                except Exception as e:
-                    logger.warning(f"Failed to generate presigned URL for avatar: {e}")
-                    avatar_url = None
-
-            entry = LeaderboardEntry(
-                rank=999,
-                submission_id=submission.id,
-                title=submission.title,
-                user_id=submission.user_id,
-                username=submission.user.username if submission.user else "Unknown",
-                avatar_url=avatar_url,
-                final_score=None,
-                human_scores_average=data["human_scores_average"],
-                num_judges_assigned=data["num_judges_assigned"],
-                num_judges_completed=data["num_judges_completed"],
-                judging_complete=data["judging_complete"],
-                has_tie=False,
-                is_public=submission.is_public,
-            )
-            entries.append(entry)
+    for submission, rank, score_peers in rows:
+        # Generate signed URL for avatar if available
+        avatar_url = None
+        if submission.user and submission.user.avatar_url:
+            try:
+                avatar_url = generate_image_url(submission.user.avatar_url, expiration=86400)  # 24 hours
+            except Exception as e:
+                logger.warning(f"Failed to generate presigned URL for avatar: {e}")
+                avatar_url = None
+
+        # Only scored submissions are ranked; unscored ones get 999
+        scored = submission.final_score is not None
+
+        entries.append(LeaderboardEntry(
+            rank=rank if scored else 999,
+            submission_id=submission.id,
+            title=submission.title,
+            user_id=submission.user_id,
+            username=submission.user.username if submission.user else "Unknown",
+            avatar_url=avatar_url,
+            final_score=submission.final_score,
+            human_scores_average=submission.human_scores_average,
+            num_judges_assigned=submission.num_judges_assigned,
+            num_judges_completed=submission.num_judges_completed,
+            judging_complete=(
+                submission.num_judges_assigned > 0
+                and submission.num_judges_completed == submission.num_judges_assigned
+            ),
+            has_tie=scored and score_peers > 1,
+            is_public=submission.is_public,
+        ))
 
     # 7. Return leaderboard
     return CompetitionLeaderboard(
@@ -479,8 +455,8 @@ async def get_competition_results(
         prize_structure=competition.prize_structure,
         entries=entries,
         total_submissions=total_submissions or 0,
-        eligible_submissions=len(eligible_submissions),
-        fully_judged_count=fully_judged_count,
+        eligible_submissions=eligible_count or 0,
+        fully_judged_count=fully_judged_count or 0,
     )
 
 
@@ -496,16 +472,7 @@ async def delete_competition(
     Requires ADMIN role.
     """
     # Get competition
-    result = await db.execute(
-        select(Competition).where(Competition.id == competition_id)
-    )
-    competition = result.scalar_one_or_none()
-
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Competition not found",
-        )
+    competition = await _get_competition_or_404(db, competition_id)
 
     # Only allow deleting draft competitions
     if competition.status != CompetitionStatus.DRAFT:
@@ -536,30 +503,17 @@ async def upload_competition_image(
     Validates file type (jpg, jpeg, png, webp) and size (max 5MB).
     Uploads to S3 and updates competition record.
     """
-    # Debug logging
-    if settings.debug:
-        print("=" * 80)
-        print("=== IMAGE UPLOAD ENDPOINT CALLED ===")
-        print(f"Competition ID: {competition_id}")
-        print(f"File: {file.filename if file else 'No file'}")
-        print(f"File content type: {file.content_type if file else 'N/A'}")
-        print(f"User: {current_user.email}")
-        print(f"User role: {current_user.role}")
-        print("=" * 80)
-
-    # Fetch competition
-    result = await db.execute(
-        select(Competition)
-        .options(selectinload(Competition.creator))
-        .where(Competition.id == competition_id)
+    logger.debug(
+        "Competition image upload: competition_id=%s file=%s content_type=%s user=%s role=%s",
+        competition_id,
+        file.filename if file else None,
+        file.content_type if file else None,
+        current_user.email,
+        current_user.role,
     )
-    competition = result.scalar_one_or_none()
 
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Competition not found",
-        )
+    # Fetch competition
+    competition = await _get_competition_or_404(db, competition_id, load_creator=True)
 
     # Validate file type
     allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/webp"]
@@ -574,12 +528,9 @@ async def upload_competition_image(
     file_size = len(contents)
     max_size = 5 * 1024 * 1024  # 5MB in bytes
 
-    if settings.debug:
-        print(f"File size: {file_size / (1024 * 1024):.2f}MB")
+    logger.debug("Competition image size: %d bytes", file_size)
 
     if file_size > max_size:
-        if settings.debug:
-            print(f"ERROR: File too large!")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File too large. Maximum size is 5MB, got {file_size / (1024 * 1024):.2f}MB.",
@@ -593,36 +544,29 @@ async def upload_competition_image(
         "image/webp": "webp",
     }
     extension = ext_map[file.content_type]
-    if settings.debug:
-        print(f"File extension: {extension}")
 
     # Delete old image if exists
     if competition.image_key:
         try:
-            delete_file(competition.image_key)
+            await delete_file_async(competition.image_key)
             logger.info(f"Deleted old competition image: {competition.image_key}")
         except Exception as e:
             logger.warning(f"Failed to delete old competition image: {e}")
 
     # Upload new image to S3
     s3_key = f"competitions/{competition_id}/cover-image.{extension}"
-    if settings.debug:
-        print(f"S3 key: {s3_key}")
-        print(f"S3 bucket: {settings.aws_s3_bucket}")
+    logger.debug("Uploading competition image to s3://%s/%s", settings.aws_s3_bucket, s3_key)
 
     try:
-        s3_client.put_object(
+        await asyncio.to_thread(
+            s3_client.put_object,
             Bucket=settings.aws_s3_bucket,
             Key=s3_key,
             Body=contents,
             ContentType=file.content_type,
         )
-        if settings.debug:
-            print(f"✓ Successfully uploaded to S3: {s3_key}")
         logger.info(f"Uploaded competition image to S3: {s3_key}")
     except Exception as e:
-        if settings.debug:
-            print(f"✗ Failed to upload to S3: {e}")
         logger.error(f"Failed to upload competition image to S3: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -632,32 +576,16 @@ async def upload_competition_image(
     # Update competition record with image_key only (URL generated on GET requests)
     competition.image_key = s3_key
     competition.image_url = None  # Don't store URL in DB - will be generated fresh on each GET
-    if settings.debug:
-        print(f"Updating competition {competition_id} with image_key")
 
+    # Sessions don't expire on commit, so the loaded instance (and its creator)
+    # can be returned directly without re-fetching
     await db.commit()
-    await db.refresh(competition)
-    if settings.debug:
-        print(f"✓ Competition updated successfully")
-        print("=" * 80)
-
-    # Fetch with relationships
-    result = await db.execute(
-        select(Competition)
-        .options(selectinload(Competition.creator))
-        .where(Competition.id == competition.id)
-    )
-    competition = result.scalar_one()
 
-    # Generate fresh presigned URL for immediate response (7 days)
+    # Generate fresh signed URL for immediate response (7 days)
     if competition.image_key:
         try:
-            competition.image_url = generate_presigned_url(competition.image_key, expiration=604800)
-            if settings.debug:
-                print(f"✓ Generated presigned URL for response: {competition.image_url[:50]}...")
+            competition.image_url = generate_image_url(competition.image_key, expiration=604800)
         except Exception as e:
-            if settings.debug:
-                print(f"✗ Failed to generate presigned URL: {e}")
             logger.warning(f"Failed to generate presigned URL: {e}")
             competition.image_url = None
 
@@ -678,16 +606,7 @@ async def delete_competition_image(
     Removes image from S3 and clears image fields in competition record.
     """
     # Fetch competition
-    result = await db.execute(
-        select(Competition).where(Competition.id == competition_id)
-    )
-    competition = result.scalar_one_or_none()
-
-    if not competition:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Competition not found",
-        )
+    competition = await _get_competition_or_404(db, competition_id)
 
     if not competition.image_key:
         raise HTTPException(
@@ -697,7 +616,7 @@ async def delete_competition_image(
 
     # Delete from S3
     try:
-        delete_file(competition.image_key)
+        await delete_file_async(competition.image_key)
         logger.info(f"Deleted competition image from S3: {competition.image_key}")
     except Exception as e:
         logger.warning(f"Failed to delete competition image from S3: {e}")
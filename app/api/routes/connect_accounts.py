@@ -1,4 +1,3 @@
-from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -7,6 +6,7 @@ from app.database import get_db
 from app.models.user import User
 from app.models.submission import Submission, SubmissionStatus
 from app.models.payment import Payment, PaymentType
+from app.models.types import utc_now
 from app.schemas.connect_account import (
     ConnectAccountResponse,
     ConnectAccountStatusResponse,
@@ -18,6 +18,8 @@ from app.schemas.bank_account import (
     WinningSubmissionPayout,
 )
 from app.core.security import get_current_user_obj
+from app.core.stripe_cache import get_cached_account, retrieve_account_status
+from app.core.stripe_service import call_stripe, new_idempotency_key, stripe_rate_limited_exception
 import stripe
 from app.config import get_settings
 
@@ -27,6 +29,10 @@ settings = get_settings()
 # Configure Stripe
 stripe.api_key = settings.stripe_secret_key
 
+# Onboarding link redirect targets
+ONBOARDING_REFRESH_URL = f"{settings.frontend_url}/payouts"
+ONBOARDING_RETURN_URL = f"{settings.frontend_url}/connect/complete"
+
 
 @router.post("/", response_model=ConnectAccountResponse)
 async def create_connect_account(
@@ -42,6 +48,7 @@ async def create_connect_account(
 
     Returns onboarding URL for user to complete Stripe's verification process.
     """
+    mutated = False
     try:
         # a. Check if user already has stripe_connect_account_id
         if current_user.stripe_connect_account_id:
@@ -53,7 +60,8 @@ async def create_connect_account(
             # User has account but onboarding incomplete - skip to step c
         else:
             # b. Create Stripe Express Connected Account
-            account = stripe.Account.create(
+            account = await call_stripe(
+                stripe.Account.create,
                 type='express',
                 country='US',
                 email=current_user.email,
@@ -64,21 +72,25 @@ async def create_connect_account(
                 metadata={
                     'user_id': str(current_user.id),
                     'username': current_user.username,
-                }
+                },
+                idempotency_key=new_idempotency_key(),
             )
             # Save account ID
             current_user.stripe_connect_account_id = account.id
+            mutated = True
 
         # c. Create account onboarding link
-        account_link = stripe.AccountLink.create(
+        account_link = await call_stripe(
+            stripe.AccountLink.create,
             account=current_user.stripe_connect_account_id,
-            refresh_url=f"{settings.frontend_url}/payouts",
-            return_url=f"{settings.frontend_url}/connect/complete",
+            refresh_url=ONBOARDING_REFRESH_URL,
+            return_url=ONBOARDING_RETURN_URL,
             type='account_onboarding',
         )
 
-        # d. Commit to database
-        await db.commit()
+        # d. Commit to database (only if a new account was saved)
+        if mutated:
+            await db.commit()
 
         # e. Return response
         return ConnectAccountResponse(
@@ -87,6 +99,8 @@ async def create_connect_account(
             message="Complete onboarding at the provided URL",
         )
 
+    except stripe.error.RateLimitError:
+        raise stripe_rate_limited_exception()
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -123,23 +137,35 @@ async def get_connect_account_status(
                 connect_account_id=None,
             )
 
-        # b. Retrieve account from Stripe
-        account = stripe.Account.retrieve(current_user.stripe_connect_account_id)
+        # b. Retrieve account from Stripe (cached for a short TTL)
+        account = get_cached_account(current_user.stripe_connect_account_id)
+        if account is None:
+            # Release the pooled DB connection while waiting on Stripe; the
+            # session reacquires one only if the user record needs updating
+            await db.commit()
+            account = await retrieve_account_status(current_user.stripe_connect_account_id)
 
         # c. Check account capabilities
-        charges_enabled = account.charges_enabled
-        payouts_enabled = account.payouts_enabled
-        details_submitted = account.details_submitted
-
-        # d. Update user record if changed
-        current_user.connect_charges_enabled = charges_enabled
-        current_user.connect_payouts_enabled = payouts_enabled
+        charges_enabled = account["charges_enabled"]
+        payouts_enabled = account["payouts_enabled"]
+        details_submitted = account["details_submitted"]
+
+        # d. Update user record only if something changed
+        mutated = False
+        if current_user.connect_charges_enabled != charges_enabled:
+            current_user.connect_charges_enabled = charges_enabled
+            mutated = True
+        if current_user.connect_payouts_enabled != payouts_enabled:
+            current_user.connect_payouts_enabled = payouts_enabled
+            mutated = True
 
         if details_submitted and not current_user.connect_onboarding_complete:
             current_user.connect_onboarding_complete = True
-            current_user.connect_onboarded_at = datetime.utcnow()
+            current_user.connect_onboarded_at = utc_now()
+            mutated = True
 
-        await db.commit()
+        if mutated:
+            await db.commit()
 
         # e. Return status
         account_status = "active" if (charges_enabled and payouts_enabled) else "pending"
@@ -152,6 +178,8 @@ async def get_connect_account_status(
             connect_account_id=current_user.stripe_connect_account_id,
         )
 
+    except stripe.error.RateLimitError:
+        raise stripe_rate_limited_exception()
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -182,10 +210,11 @@ async def refresh_onboarding_link(
             )
 
         # b. Create new account link
-        account_link = stripe.AccountLink.create(
+        account_link = await call_stripe(
+            stripe.AccountLink.create,
             account=current_user.stripe_connect_account_id,
-            refresh_url=f"{settings.frontend_url}/payouts",
-            return_url=f"{settings.frontend_url}/connect/complete",
+            refresh_url=ONBOARDING_REFRESH_URL,
+            return_url=ONBOARDING_RETURN_URL,
             type='account_onboarding',
         )
 
@@ -194,6 +223,8 @@ async def refresh_onboarding_link(
             onboarding_url=account_link.url,
         )
 
+    except stripe.error.RateLimitError:
+        raise stripe_rate_limited_exception()
     except stripe.error.StripeError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -238,28 +269,31 @@ async def get_payout_status(
         )
         .options(
             selectinload(Submission.competition),
-            selectinload(Submission.payments),
+            # Only load the prize payout, not every payment on the submission
+            selectinload(
+                Submission.payments.and_(Payment.type == PaymentType.PRIZE_PAYOUT)
+            ),
         )
     )
     winning_submissions = result.scalars().all()
 
     # Build winning submissions list with payout info
     winning_submissions_list = []
+    prize_amounts = {}  # (competition_id, placement) -> prize amount
     for submission in winning_submissions:
-        # Find prize payout payment for this submission
-        prize_payment = None
-        for payment in submission.payments:
-            if payment.type == PaymentType.PRIZE_PAYOUT:
-                prize_payment = payment
-                break
-
-        # Calculate prize amount from competition
-        prize_amount = 0
-        if submission.placement and submission.competition:
-            prize_structure = submission.competition.prize_structure
-            if submission.placement in prize_structure:
-                prize_percentage = prize_structure[submission.placement]
-                prize_amount = float(submission.competition.prize_pool) * prize_percentage
+        # Prize payout payment for this submission (payments are pre-filtered)
+        prize_payment = submission.payments[0] if submission.payments else None
+
+        # Calculate prize amount from competition (once per competition/placement)
+        prize_key = (submission.competition_id, submission.placement)
+        prize_amount = prize_amounts.get(prize_key)
+        if prize_amount is None:
+            prize_amount = 0
+            if submission.placement and submission.competition:
+                prize_percentage = submission.competition.prize_structure.get(submission.placement)
+                if prize_percentage is not None:
+                    prize_amount = float(submission.competition.prize_pool) * prize_percentage
+            prize_amounts[prize_key] = prize_amount
 
         winning_submissions_list.append(
             WinningSubmissionPayout(
@@ -1,26 +1,35 @@
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 from app.core.stripe_service import create_payment_intent
+from app.config import get_settings
 
 router = APIRouter()
+settings = get_settings()
+
+# Static bodies serialized once; these endpoints are polled by load balancers
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "message": "Service is running"})
+_ROOT_BODY = orjson.dumps({"message": "Welcome to FastAPI", "docs": "/docs"})
 
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "message": "Service is running"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.get("/")
 async def root():
     """Root endpoint."""
-    return {"message": "Welcome to FastAPI", "docs": "/docs"}
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@router.post("/test-stripe")
 async def test_stripe():
     """
     Test Stripe connection by creating a test payment intent for $10.
 
+    Only registered when debug is enabled: it is unauthenticated and calls
+    the live Stripe API, so it must not be reachable in production.
+
     Returns the payment_intent_id and client_secret for testing purposes.
     """
     # Create a test payment intent for $10.00 (1000 cents)
@@ -40,3 +49,7 @@ async def test_stripe():
         "currency": payment_intent.currency,
         "status": payment_intent.status,
     }
+
+
+if settings.debug:
+    router.post("/test-stripe")(test_stripe)
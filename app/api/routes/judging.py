@@ -1,19 +1,37 @@
-from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, cast, Float, or_, case, exists, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import selectinload, contains_eager, load_only
 from app.database import get_db
 from app.models.submission import Submission, SubmissionStatus
-from app.models.competition import Competition
+from app.models.competition import Competition, CompetitionStatus
 from app.models.user import User, UserRole
 from app.models.judge_assignment import JudgeAssignment
+from app.models.types import utc_now
 from app.schemas.judging import JudgeScoreSubmit, SubmissionWithScores
 from app.core.security import require_role, get_current_user_obj
+from app.services.judging_service import refresh_judging_counts
 
 router = APIRouter()
 
+# Loader options for judging lists: the competition row is repeated per joined
+# submission, so only the columns SubmissionWithScores needs are selected
+_judging_list_options = (
+    selectinload(Submission.user).load_only(User.id, User.username, User.email),
+    contains_eager(Submission.competition).load_only(
+        Competition.id,
+        Competition.title,
+        Competition.domain,
+        Competition.status,
+        Competition.image_url,
+        Competition.prize_pool,
+        Competition.prize_structure,
+        Competition.rubric,
+    ),
+)
+
 
 @router.get("/assignments", response_model=List[dict])
 async def get_judge_assignments(
@@ -29,74 +47,88 @@ async def get_judge_assignments(
     - scoring progress (completed/total)
     """
 
-    # Get all judge assignments for current user
+    # Current judge's overall score, extracted from human_scores in SQL
+    judge_score_expr = cast(
+        func.jsonb_path_query_first(
+            cast(Submission.human_scores, JSONB),
+            # A typed jsonpath literal; a bound string would be sent as VARCHAR
+            literal_column("'$.judges[*] ? (@.judge_id == $jid).overall'::jsonpath"),
+            func.jsonb_build_object("jid", current_user.id),
+        ),
+        Float,
+    ).label("judge_score")
+
+    # 1. Per-competition progress, aggregated in SQL
     result = await db.execute(
-        select(JudgeAssignment)
+        select(
+            Competition,
+            func.count(JudgeAssignment.id).label("total"),
+            func.count(JudgeAssignment.completed_at).label("completed"),
+        )
+        .join(Submission, Submission.competition_id == Competition.id)
+        .join(JudgeAssignment, JudgeAssignment.submission_id == Submission.id)
         .options(
-            selectinload(JudgeAssignment.submission).selectinload(Submission.competition),
-            selectinload(JudgeAssignment.submission).selectinload(Submission.user)
+            load_only(
+                Competition.id,
+                Competition.title,
+                Competition.domain,
+                Competition.prize_pool,
+                Competition.deadline,
+                Competition.status,
+            )
+        )
+        .where(JudgeAssignment.judge_id == current_user.id)
+        .group_by(Competition.id)
+        # Competitions in the order the judge was first assigned to them
+        .order_by(func.min(JudgeAssignment.id))
+    )
+    competition_rows = result.all()
+
+    # 2. Assigned submissions, as plain columns
+    result = await db.execute(
+        select(
+            Submission.id,
+            Submission.title,
+            Submission.competition_id,
+            User.id.label("user_id"),
+            User.username,
+            JudgeAssignment.completed_at,
+            judge_score_expr,
         )
+        .join(JudgeAssignment, JudgeAssignment.submission_id == Submission.id)
+        .join(User, User.id == Submission.user_id)
         .where(JudgeAssignment.judge_id == current_user.id)
+        .order_by(JudgeAssignment.id)
     )
-    assignments = result.scalars().all()
-
-    # Group assignments by competition
-    competitions_map = {}
-
-    for assignment in assignments:
-        comp_id = assignment.submission.competition_id
-
-        if comp_id not in competitions_map:
-            competitions_map[comp_id] = {
-                "competition": assignment.submission.competition,
-                "submissions": [],
-                "completed": 0,
-                "total": 0
-            }
-
-        # Check if judge has scored this submission
-        has_scored = assignment.completed_at is not None
-        judge_score = None
-
-        # Get judge's score from submission's human_scores
-        if assignment.submission.human_scores:
-            judges_list = assignment.submission.human_scores.get("judges", [])
-            for judge_score_entry in judges_list:
-                if judge_score_entry.get("judge_id") == current_user.id:
-                    judge_score = judge_score_entry.get("overall")
-                    break
-
-        # Add submission to list
-        competitions_map[comp_id]["submissions"].append({
-            "id": assignment.submission.id,
-            "title": assignment.submission.title,
+
+    submissions_by_competition = {}
+    for row in result:
+        submissions_by_competition.setdefault(row.competition_id, []).append({
+            "id": row.id,
+            "title": row.title,
             "user": {
-                "id": assignment.submission.user.id,
-                "username": assignment.submission.user.username
+                "id": row.user_id,
+                "username": row.username
             },
-            "has_scored": has_scored,
-            "judge_score": judge_score
+            "has_scored": row.completed_at is not None,
+            "judge_score": row.judge_score
         })
 
-        competitions_map[comp_id]["total"] += 1
-        if has_scored:
-            competitions_map[comp_id]["completed"] += 1
-
     # Format response
     response = []
-    for comp_data in competitions_map.values():
+    for competition, total, completed in competition_rows:
         response.append({
             "competition": {
-                "id": comp_data["competition"].id,
-                "title": comp_data["competition"].title,
-                "domain": comp_data["competition"].domain,
-                "prize_pool": float(comp_data["competition"].prize_pool),
-                "deadline": comp_data["competition"].deadline.isoformat(),
-                "status": comp_data["competition"].status.value
+                "id": competition.id,
+                "title": competition.title,
+                "domain": competition.domain,
+                "prize_pool": float(competition.prize_pool),
+                "deadline": competition.deadline.isoformat(),
+                "status": competition.status.value
             },
-            "submissions": comp_data["submissions"],
-            "completed": comp_data["completed"],
-            "total": comp_data["total"]
+            "submissions": submissions_by_competition.get(competition.id, []),
+            "completed": completed,
+            "total": total
         })
 
     return response
@@ -120,97 +152,71 @@ async def get_competition_submissions_for_judging(
     For other competitions: Filters for SUBMITTED, UNDER_REVIEW, or WINNER
     Orders by final_score descending for completed, submitted_at ascending otherwise
     """
-    # First, get the competition to check its status
-    comp_result = await db.execute(
-        select(Competition).where(Competition.id == competition_id)
+    # The competition is joined into the submissions query (and eagerly populated
+    # from it), so its status drives filtering and ordering in SQL without a
+    # separate competition lookup.
+    is_complete = Competition.status == CompetitionStatus.COMPLETE
+
+    # For COMPLETE competitions show everything, otherwise only judgeable statuses
+    status_filter = or_(
+        is_complete,
+        Submission.status.in_([
+            SubmissionStatus.SUBMITTED,
+            SubmissionStatus.UNDER_REVIEW,
+            SubmissionStatus.WINNER,
+        ]),
     )
-    competition = comp_result.scalar_one_or_none()
 
-    if not competition:
-        raise HTTPException(status_code=404, detail="Competition not found")
+    # Order by final_score desc for completed competitions, otherwise by submitted_at
+    ordering = (
+        case((is_complete, Submission.final_score)).desc().nullslast(),
+        Submission.submitted_at.asc(),
+    )
 
-    # Determine if we should show all submissions (for completed competitions)
-    from app.models.competition import CompetitionStatus
-    show_all_submissions = competition.status == CompetitionStatus.COMPLETE
+    query = (
+        select(Submission)
+        .join(Submission.competition)
+        .options(*_judging_list_options)
+        .where(
+            Submission.competition_id == competition_id,
+            status_filter,
+        )
+        .order_by(*ordering)
+    )
 
-    # Build query that joins with judge assignments for judges
-    if current_user.role == UserRole.JUDGE:
-        # For judges, select both Submission and JudgeAssignment
+    # Judges only see their assigned submissions, along with the assignment
+    is_judge = current_user.role == UserRole.JUDGE
+    if is_judge:
         query = (
-            select(Submission, JudgeAssignment)
+            query
             .join(JudgeAssignment, Submission.id == JudgeAssignment.submission_id)
-            .options(
-                selectinload(Submission.user),
-                selectinload(Submission.competition),
-            )
-            .where(
-                Submission.competition_id == competition_id,
-                JudgeAssignment.judge_id == current_user.id,
-            )
+            .where(JudgeAssignment.judge_id == current_user.id)
+            .add_columns(JudgeAssignment)
         )
 
-        # Add status filter only if competition is not complete
-        if not show_all_submissions:
-            query = query.where(
-                Submission.status.in_([
-                    SubmissionStatus.SUBMITTED,
-                    SubmissionStatus.UNDER_REVIEW,
-                    SubmissionStatus.WINNER,
-                ])
-            )
-
-        # Order by final_score desc for completed competitions, otherwise by submitted_at
-        if show_all_submissions:
-            query = query.order_by(Submission.final_score.desc().nullslast())
-        else:
-            query = query.order_by(Submission.submitted_at.asc())
-
-        result = await db.execute(query)
+    result = await db.execute(query)
+    if is_judge:
         rows = result.all()
-
-        # Convert to SubmissionWithScores format with assignment data
-        return [
-            SubmissionWithScores.from_submission(
-                submission=submission,
-                assignment=assignment,
-                current_judge_id=current_user.id
-            )
-            for submission, assignment in rows
-        ]
     else:
-        # For admins, just select submissions (no assignment filtering)
-        query = (
-            select(Submission)
-            .options(
-                selectinload(Submission.user),
-                selectinload(Submission.competition),
-            )
-            .where(
-                Submission.competition_id == competition_id,
-            )
-        )
-
-        # Add status filter only if competition is not complete
-        if not show_all_submissions:
-            query = query.where(
-                Submission.status.in_([
-                    SubmissionStatus.SUBMITTED,
-                    SubmissionStatus.UNDER_REVIEW,
-                    SubmissionStatus.WINNER,
-                ])
-            )
+        rows = [(submission, None) for submission in result.scalars().all()]
 
-        # Order by final_score desc for completed competitions, otherwise by submitted_at
-        if show_all_submissions:
-            query = query.order_by(Submission.final_score.desc().nullslast())
-        else:
-            query = query.order_by(Submission.submitted_at.asc())
-
-        result = await db.execute(query)
-        submissions = result.scalars().all()
-
-        # Convert to SubmissionWithScores format without assignment data
-        return [SubmissionWithScores.from_submission(submission) for submission in submissions]
+    # Only an empty result needs to distinguish "no submissions" from "no competition"
+    if not rows:
+        competition_exists = await db.scalar(
+            select(exists().where(Competition.id == competition_id))
+        )
+        if not competition_exists:
+            raise HTTPException(status_code=404, detail="Competition not found")
+
+    # Convert to SubmissionWithScores format (with assignment data for judges)
+    return [
+        SubmissionWithScores.from_submission(
+            submission=submission,
+            assignment=assignment,
+            current_judge_id=current_user.id if assignment is not None else None,
+        )
+        for submission, assignment in rows
+    ]
 
 
 @router.post("/submissions/{submission_id}/score", response_model=SubmissionWithScores)
@@ -233,16 +239,15 @@ async def submit_judge_score(
 
     Updates the submission with the judge's scores and feedback.
     """
-    # Fetch submission with relationships
-    result = await db.execute(
-        select(Submission)
-        .where(Submission.id == submission_id)
-        .options(
+    # Fetch submission with relationships (identity-map aware)
+    submission = await db.get(
+        Submission,
+        submission_id,
+        options=[
             selectinload(Submission.user),
             selectinload(Submission.competition),
-        )
+        ],
     )
-    submission = result.scalar_one_or_none()
 
     if not submission:
         raise HTTPException(
@@ -250,7 +255,9 @@ async def submit_judge_score(
             detail="Submission not found",
         )
 
-    # Validate judge is assigned to this submission (JUDGE role only, ADMIN bypasses)
+    # Validate judge is assigned to this submission (JUDGE role only, ADMIN bypasses).
+    # The assignment is kept to mark it completed in the same transaction.
+    assignment = None
     if current_user.role == UserRole.JUDGE:
         assignment_result = await db.execute(
             select(JudgeAssignment).where(
@@ -326,25 +333,18 @@ async def submit_judge_score(
         feedback=score_data.feedback,
     )
 
-    # Commit changes
+    # Mark assignment as completed if judge is scoring (timestamped by the database)
+    completed_now = assignment is not None and assignment.completed_at is None
+    if completed_now:
+        assignment.completed_at = utc_now()
+        await db.flush()
+        await refresh_judging_counts(db, [submission_id])
+
+    # Commit score and assignment changes together
     await db.commit()
     await db.refresh(submission)
-
-    # Mark assignment as completed if judge is scoring
-    assignment = None
-    if current_user.role == UserRole.JUDGE:
-        # Fetch the assignment (we already validated it exists earlier)
-        assignment_result = await db.execute(
-            select(JudgeAssignment).where(
-                JudgeAssignment.judge_id == current_user.id,
-                JudgeAssignment.submission_id == submission_id,
-            )
-        )
-        assignment = assignment_result.scalar_one_or_none()
-
-        if assignment and assignment.completed_at is None:
-            assignment.completed_at = datetime.utcnow()
-            await db.commit()
+    if completed_now:
+        await db.refresh(assignment, attribute_names=["completed_at"])
 
     # Return updated submission with assignment data
     return SubmissionWithScores.from_submission(
@@ -370,16 +370,15 @@ async def get_submission_for_judging(
 
     Returns submission with parsed judge scores and feedback.
     """
-    # Fetch submission with relationships
-    result = await db.execute(
-        select(Submission)
-        .where(Submission.id == submission_id)
-        .options(
+    # Fetch submission with relationships (identity-map aware)
+    submission = await db.get(
+        Submission,
+        submission_id,
+        options=[
             selectinload(Submission.user),
             selectinload(Submission.competition),
-        )
+        ],
     )
-    submission = result.scalar_one_or_none()
 
     if not submission:
         raise HTTPException(
@@ -387,18 +386,20 @@ async def get_submission_for_judging(
             detail="Submission not found",
         )
 
-    # Validate judge is assigned to this submission (JUDGE role only, ADMIN bypasses)
+    # Validate judge is assigned to this submission (JUDGE role only, ADMIN bypasses).
+    # Only completed_at is needed for the response, so the full assignment row
+    # isn't loaded; the returned Row exposes .completed_at like the ORM object.
     assignment = None
     if current_user.role == UserRole.JUDGE:
         assignment_result = await db.execute(
-            select(JudgeAssignment).where(
+            select(JudgeAssignment.completed_at).where(
                 JudgeAssignment.judge_id == current_user.id,
                 JudgeAssignment.submission_id == submission_id,
             )
         )
-        assignment = assignment_result.scalar_one_or_none()
+        assignment = assignment_result.first()
 
-        if not assignment:
+        if assignment is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You are not assigned to judge this submission",
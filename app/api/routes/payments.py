@@ -1,28 +1,41 @@
 import logging
-from datetime import datetime
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Awaitable, Callable, Dict
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, cast, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload
+import orjson
 import stripe
-from app.database import get_db
+from app.database import engine, AsyncSessionLocal
 from app.models.payment import Payment, PaymentStatus, PaymentType
 from app.models.submission import Submission, SubmissionStatus
 from app.models.competition import Competition
 from app.models.user import User
+from app.models.stripe_event import StripeProcessedEvent
+from app.models.types import utc_now
 from app.config import get_settings
 from app.core.security import get_current_user_obj
+from app.core.stripe_cache import invalidate_account
+from app.core.stripe_service import verify_webhook_signature
 
 router = APIRouter()
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Bound once at import; the webhook path reads these on every event
+_WEBHOOK_SECRET: bytes = settings.stripe_webhook_secret.encode()
+_COMPLETED = PaymentStatus.COMPLETED.value
+_FAILED = PaymentStatus.FAILED.value
+_SUBMITTED = SubmissionStatus.SUBMITTED.value
+
 
 @router.post("/webhooks/stripe")
 async def stripe_webhook(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
 ):
     """
     Stripe webhook endpoint for handling payment events.
@@ -33,6 +46,10 @@ async def stripe_webhook(
     - transfer.paid: Marks Payment as completed (prize payouts)
     - transfer.failed: Marks Payment as failed (prize payouts)
     - transfer.created: Logs transfer creation for audit trail (prize payouts)
+    - account.updated: Invalidates cached Connect account status
+
+    Other event types are acknowledged with {"status": "ignored"}. Handled
+    events are processed in a background task after the response is sent.
 
     Returns 200 for all events to prevent Stripe from retrying.
     """
@@ -50,11 +67,8 @@ async def stripe_webhook(
 
     # Verify webhook signature
     try:
-        event = stripe.Webhook.construct_event(
-            payload,
-            sig_header,
-            settings.stripe_webhook_secret,
-        )
+        verify_webhook_signature(payload, sig_header, _WEBHOOK_SECRET)
+        event = orjson.loads(payload)
     except ValueError as e:
         # Invalid payload
         logger.error(f"Invalid webhook payload: {e}")
@@ -71,42 +85,83 @@ async def stripe_webhook(
         )
 
     # Get event data
+    event_id = event["id"]
     event_type = event["type"]
+
+    # Acknowledge event types we don't act on without any further work
+    if event_type not in HANDLED_EVENT_TYPES:
+        return {"status": "ignored"}
+
     event_data = event["data"]["object"]
 
     logger.info(f"Received Stripe webhook event: {event_type}")
 
+    # Process after the response is sent, so slow DB work never counts
+    # against Stripe's delivery timeout
+    background_tasks.add_task(
+        process_stripe_event_in_background, event_id, event_type, event_data
+    )
+
+    # Return 200 to acknowledge receipt
+    return {"status": "queued"}
+
+
+async def process_stripe_event_in_background(
+    event_id: str, event_type: str, event_data: dict
+) -> None:
+    """Run process_stripe_event as a background task, logging any failure."""
     try:
-        # Handle payment_intent.succeeded event
-        if event_type == "payment_intent.succeeded":
-            await handle_payment_intent_succeeded(db, event_data)
+        await process_stripe_event(event_id, event_type, event_data)
+    except Exception as e:
+        # The response has already been sent; the unrecorded event can be
+        # replayed from the Stripe dashboard
+        logger.error(f"Error processing webhook event {event_type}: {str(e)}", exc_info=True)
 
-        # Handle payment_intent.payment_failed event
-        elif event_type == "payment_intent.payment_failed":
-            await handle_payment_intent_failed(db, event_data)
 
-        # Handle transfer events (prize payouts)
-        elif event_type == "transfer.paid":
-            await handle_transfer_paid(db, event_data)
+async def process_stripe_event(event_id: str, event_type: str, event_data: dict) -> None:
+    """
+    Process a verified Stripe event.
 
-        elif event_type == "transfer.failed":
-            await handle_transfer_failed(db, event_data)
+    Self-contained unit of work: opens its own database session instead of
+    borrowing the request's, so it can run outside the request lifecycle.
 
-        elif event_type == "transfer.created":
-            await handle_transfer_created(db, event_data)
+    The event ID is recorded in the same transaction as the handler's writes,
+    so redelivered events are skipped and a failed handler leaves the event
+    unrecorded. Stripe has already received its 200 by then and will not
+    retry, so a failed event must be replayed by hand (e.g. from the Stripe
+    dashboard). Handlers only stage changes; the single commit happens here.
 
-        else:
-            # Log unhandled event types
-            logger.info(f"Unhandled event type: {event_type}")
+    Log-only events (transfer.created, account.updated) are handled before
+    any database work, so audit bursts never take a pooled connection away
+    from the entry-fee and payout write paths.
+    """
+    log_only_handler = LOG_ONLY_DISPATCH.get(event_type)
+    if log_only_handler is not None:
+        log_only_handler(event_data)
+        return
 
-    except Exception as e:
-        # Log the error but return 200 so Stripe doesn't retry
-        logger.error(f"Error processing webhook event {event_type}: {str(e)}", exc_info=True)
-        # Still return 200 to acknowledge receipt
-        return {"status": "error", "message": str(e)}
+    handler = DISPATCH.get(event_type)
+    if handler is None:
+        logger.info(f"Unhandled event type: {event_type}")
+        return
 
-    # Return 200 to acknowledge receipt
-    return {"status": "success"}
+    async with AsyncSessionLocal() as db:
+        # Idempotency: claim the event ID; a concurrent delivery blocks on the
+        # primary key until this transaction finishes, then gets no row back
+        result = await db.execute(
+            pg_insert(StripeProcessedEvent)
+            .values(event_id=event_id, event_type=event_type)
+            .on_conflict_do_nothing(index_elements=[StripeProcessedEvent.event_id])
+            .returning(StripeProcessedEvent.event_id)
+        )
+        if result.scalar_one_or_none() is None:
+            logger.info(f"Skipping already processed Stripe event {event_id} ({event_type})")
+            return
+
+        await handler(db, event_data)
+
+        # Commit the handler's changes together with the processed-event row
+        await db.commit()
 
 
 async def handle_payment_intent_succeeded(
@@ -124,9 +179,16 @@ async def handle_payment_intent_succeeded(
     payment_intent_id = payment_intent["id"]
     logger.info(f"Processing payment_intent.succeeded for {payment_intent_id}")
 
-    # Find Payment record
+    # Find Payment record along with its submission in one query.
+    # The payment row is locked until commit so concurrent redeliveries of this
+    # event serialize here and see the status written by the first one.
+    # (Only the payments table is locked: Postgres can't lock the nullable side
+    # of the outer join used for the submission.)
     result = await db.execute(
-        select(Payment).where(Payment.stripe_payment_intent_id == payment_intent_id)
+        select(Payment)
+        .options(joinedload(Payment.submission))
+        .where(Payment.stripe_payment_intent_id == payment_intent_id)
+        .with_for_update(of=Payment)
     )
     payment = result.scalar_one_or_none()
 
@@ -134,45 +196,44 @@ async def handle_payment_intent_succeeded(
         logger.error(f"Payment not found for PaymentIntent {payment_intent_id}")
         return
 
-    # Check if already processed
-    if payment.status == PaymentStatus.COMPLETED:
+    # Check if already processed (re-checked under the row lock)
+    if payment.status == _COMPLETED:
         logger.info(f"Payment {payment.id} already processed, skipping")
         return
 
     # Update Payment record
-    payment.status = PaymentStatus.COMPLETED.value
-    payment.processed_at = datetime.utcnow()
+    payment.status = _COMPLETED
+    payment.processed_at = utc_now()
 
-    # Find related Submission
+    # Update related Submission
     if payment.submission_id:
-        result = await db.execute(
-            select(Submission).where(Submission.id == payment.submission_id)
-        )
-        submission = result.scalar_one_or_none()
+        submission = payment.submission
 
         if submission:
             # Update Submission status to submitted
-            submission.status = SubmissionStatus.SUBMITTED.value
-            submission.submitted_at = datetime.utcnow()
+            submission.status = _SUBMITTED
+            submission.submitted_at = utc_now()
 
-            # Find related Competition
+            # Increment current entries and add the entry fee minus platform fee
+            # to the prize pool, atomically in the database
             result = await db.execute(
-                select(Competition).where(Competition.id == payment.competition_id)
+                update(Competition)
+                .where(Competition.id == payment.competition_id)
+                .values(
+                    current_entries=Competition.current_entries + 1,
+                    prize_pool=Competition.prize_pool + (
+                        Competition.entry_fee_cents - Competition.platform_fee_cents
+                    ) / 100,
+                )
+                .returning(Competition.current_entries, Competition.prize_pool)
             )
-            competition = result.scalar_one_or_none()
-
-            if competition:
-                # Increment current entries
-                competition.current_entries += 1
-
-                # Update prize pool (add entry fee minus platform fee)
-                platform_fee = competition.entry_fee * (competition.platform_fee_percentage / 100)
-                competition.prize_pool += (competition.entry_fee - platform_fee)
+            updated = result.one_or_none()
 
+            if updated:
                 logger.info(
-                    f"Updated competition {competition.id}: "
-                    f"current_entries={competition.current_entries}, "
-                    f"prize_pool={competition.prize_pool}"
+                    f"Updated competition {payment.competition_id}: "
+                    f"current_entries={updated.current_entries}, "
+                    f"prize_pool={updated.prize_pool}"
                 )
             else:
                 logger.error(f"Competition not found for Payment {payment.id}")
@@ -183,9 +244,6 @@ async def handle_payment_intent_succeeded(
     else:
         logger.warning(f"Payment {payment.id} has no associated submission")
 
-    # Commit all changes
-    await db.commit()
-
     logger.info(f"Successfully processed payment_intent.succeeded for {payment_intent_id}")
 
 
@@ -202,22 +260,22 @@ async def handle_payment_intent_failed(
     payment_intent_id = payment_intent["id"]
     logger.info(f"Processing payment_intent.payment_failed for {payment_intent_id}")
 
-    # Find Payment record
+    # Mark Payment as failed in a single statement (never downgrade a completed payment)
     result = await db.execute(
-        select(Payment).where(Payment.stripe_payment_intent_id == payment_intent_id)
+        update(Payment)
+        .where(
+            Payment.stripe_payment_intent_id == payment_intent_id,
+            Payment.status != _COMPLETED,
+        )
+        .values(status=_FAILED, processed_at=utc_now())
+        .returning(Payment.id)
     )
-    payment = result.scalar_one_or_none()
+    payment_id = result.scalar_one_or_none()
 
-    if not payment:
-        logger.error(f"Payment not found for PaymentIntent {payment_intent_id}")
+    if payment_id is None:
+        logger.error(f"No pending payment found for PaymentIntent {payment_intent_id}")
         return
 
-    # Update Payment record
-    payment.status = PaymentStatus.FAILED.value
-    payment.processed_at = datetime.utcnow()
-
-    await db.commit()
-
     logger.info(f"Successfully processed payment_intent.payment_failed for {payment_intent_id}")
 
 
@@ -227,19 +285,18 @@ async def handle_transfer_paid(db: AsyncSession, transfer: dict):
     logger.info(f"Processing transfer.paid: {transfer_id}")
 
     result = await db.execute(
-        select(Payment).where(Payment.stripe_transfer_id == transfer_id)
+        update(Payment)
+        .where(Payment.stripe_transfer_id == transfer_id)
+        .values(status=_COMPLETED, processed_at=utc_now())
+        .returning(Payment.id)
     )
-    payment = result.scalar_one_or_none()
+    payment_id = result.scalar_one_or_none()
 
-    if not payment:
+    if payment_id is None:
         logger.warning(f"No payment found for transfer {transfer_id}")
         return
 
-    payment.status = PaymentStatus.COMPLETED.value
-    payment.processed_at = datetime.utcnow()
-    await db.commit()
-
-    logger.info(f"Payment {payment.id} marked as COMPLETED for transfer {transfer_id}")
+    logger.info(f"Payment {payment_id} marked as COMPLETED for transfer {transfer_id}")
 
 
 async def handle_transfer_failed(db: AsyncSession, transfer: dict):
@@ -251,21 +308,21 @@ async def handle_transfer_failed(db: AsyncSession, transfer: dict):
     logger.error(f"Processing transfer.failed: {transfer_id} - {failure_code}: {failure_message}")
 
     result = await db.execute(
-        select(Payment).where(Payment.stripe_transfer_id == transfer_id)
+        update(Payment)
+        .where(Payment.stripe_transfer_id == transfer_id)
+        .values(status=_FAILED)
+        .returning(Payment.id)
     )
-    payment = result.scalar_one_or_none()
+    payment_id = result.scalar_one_or_none()
 
-    if not payment:
+    if payment_id is None:
         logger.warning(f"No payment found for transfer {transfer_id}")
         return
 
-    payment.status = PaymentStatus.FAILED.value
-    await db.commit()
+    logger.error(f"Payment {payment_id} marked as FAILED for transfer {transfer_id}")
 
-    logger.error(f"Payment {payment.id} marked as FAILED for transfer {transfer_id}")
 
-
-async def handle_transfer_created(db: AsyncSession, transfer: dict):
+def handle_transfer_created(transfer: dict):
     """Handle transfer.created event - log for audit trail."""
     transfer_id = transfer['id']
     amount = transfer['amount']
@@ -274,51 +331,110 @@ async def handle_transfer_created(db: AsyncSession, transfer: dict):
     logger.info(f"Transfer created: {transfer_id} - ${amount/100:.2f} to {destination}")
 
 
+def handle_account_updated(account: dict):
+    """Handle account.updated event - drop the cached Connect account status."""
+    invalidate_account(account["id"])
+    logger.info(f"Invalidated cached Connect account status for {account['id']}")
+
+
+# Event handlers that write to the database, called with the event's session
+DISPATCH: Dict[str, Callable[[AsyncSession, dict], Awaitable[None]]] = {
+    "payment_intent.succeeded": handle_payment_intent_succeeded,
+    "payment_intent.payment_failed": handle_payment_intent_failed,
+    "transfer.paid": handle_transfer_paid,
+    "transfer.failed": handle_transfer_failed,
+}
+
+# Event handlers that never touch the database (no session is opened)
+LOG_ONLY_DISPATCH: Dict[str, Callable[[dict], None]] = {
+    "transfer.created": handle_transfer_created,
+    "account.updated": handle_account_updated,
+}
+
+# Event types this endpoint acts on; the Stripe webhook endpoint should be
+# configured with the same list as its enabled_events
+HANDLED_EVENT_TYPES = frozenset(DISPATCH) | frozenset(LOG_ONLY_DISPATCH)
+
+# Rows fetched per round trip when streaming my-winnings
+WINNINGS_STREAM_BATCH_SIZE = 100
+
+
+def _winning_to_dict(row) -> dict:
+    """Format one prize payout row from get_my_winnings."""
+    return {
+        "id": row["id"],
+        "amount": row["amount"],
+        "status": row["status"].value,
+        "stripe_transfer_id": row["stripe_transfer_id"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+        "processed_at": row["processed_at"].isoformat() if row["processed_at"] else None,
+        "competition": {
+            "id": row["comp_id"],
+            "title": row["comp_title"],
+            "domain": row["comp_domain"],
+        } if row["comp_id"] is not None else None,
+        "submission": {
+            "id": row["sub_id"],
+            "title": row["sub_title"],
+            "placement": row["sub_placement"],
+        } if row["sub_id"] is not None else None,
+    }
+
+
+async def _stream_winnings(user_id: int):
+    """
+    Yield the user's prize payouts as a JSON array, a row at a time.
+
+    Opens its own connection: dependency-provided connections are released
+    before a StreamingResponse body is sent.
+    """
+    stmt = (
+        select(
+            Payment.id,
+            cast(Payment.amount, Float).label("amount"),
+            Payment.status,
+            Payment.stripe_transfer_id,
+            Payment.created_at,
+            Payment.processed_at,
+            Competition.id.label("comp_id"),
+            Competition.title.label("comp_title"),
+            Competition.domain.label("comp_domain"),
+            Submission.id.label("sub_id"),
+            Submission.title.label("sub_title"),
+            Submission.placement.label("sub_placement"),
+        )
+        .select_from(Payment)
+        .join(Competition, Payment.competition_id == Competition.id, isouter=True)
+        .join(Submission, Payment.submission_id == Submission.id, isouter=True)
+        .where(
+            Payment.user_id == user_id,
+            Payment.type == PaymentType.PRIZE_PAYOUT
+        )
+        .order_by(Payment.created_at.desc())
+        .execution_options(yield_per=WINNINGS_STREAM_BATCH_SIZE)
+    )
+
+    async with engine.connect() as conn:
+        result = await conn.stream(stmt)
+        separator = b"["
+        async for row in result.mappings():
+            yield separator + orjson.dumps(_winning_to_dict(row))
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
 @router.get("/my-winnings")
 async def get_my_winnings(
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user_obj),
 ):
     """
     Get current user's prize winnings.
 
     Returns list of prize payout payments with competition and submission info.
+    The JSON array is streamed as rows are read from the database.
     """
-    # Fetch all prize payout payments for current user
-    result = await db.execute(
-        select(Payment)
-        .where(
-            Payment.user_id == current_user.id,
-            Payment.type == PaymentType.PRIZE_PAYOUT
-        )
-        .options(
-            selectinload(Payment.competition),
-            selectinload(Payment.submission),
-        )
-        .order_by(Payment.created_at.desc())
+    return StreamingResponse(
+        _stream_winnings(current_user.id),
+        media_type="application/json",
     )
-    payments = result.scalars().all()
-
-    # Format response
-    return [
-        {
-            "id": payment.id,
-            "amount": float(payment.amount),
-            "status": payment.status.value,
-            "stripe_transfer_id": payment.stripe_transfer_id,
-            "created_at": payment.created_at.isoformat() if payment.created_at else None,
-            "processed_at": payment.processed_at.isoformat() if payment.processed_at else None,
-            "competition": {
-                "id": payment.competition.id,
-                "title": payment.competition.title,
-                "domain": payment.competition.domain,
-            } if payment.competition else None,
-            "submission": {
-                "id": payment.submission.id,
-                "title": payment.submission.title,
-                "placement": payment.submission.placement,
-            } if payment.submission else None,
-        }
-        for payment in payments
-    ]
 
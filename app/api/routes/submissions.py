@@ -2,15 +2,19 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from app.database import get_db
+from sqlalchemy import select, update, func, lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.database import get_db, AsyncSessionLocal
 from app.models.submission import Submission, SubmissionStatus
 from app.models.competition import Competition, CompetitionStatus
 from app.models.payment import Payment, PaymentType, PaymentStatus
 from app.models.user import User, UserRole
+from app.models.types import utc_now
 from app.schemas.submission import (
     SubmissionCreate,
     SubmissionUpdate,
@@ -18,8 +22,13 @@ from app.schemas.submission import (
     SubmissionListResponse,
 )
 from app.core.security import get_current_user
-from app.core.stripe_service import create_payment_intent, get_payment_intent
-from app.core.s3_service import upload_video, generate_presigned_url, delete_file
+from app.core.stripe_service import call_stripe, create_payment_intent, get_payment_intent, new_idempotency_key
+from app.core.s3_service import (
+    upload_video_async,
+    get_cached_presigned_url,
+    get_cached_presigned_url_with_expiry,
+    delete_file,
+)
 from app.config import get_settings
 import stripe
 
@@ -28,6 +37,18 @@ settings = get_settings()
 
 router = APIRouter()
 
+# Status groups as plain strings; SubmissionStatus is a str enum, so loaded
+# statuses hash and compare equal to these
+_EDITABLE_STATUSES = frozenset({
+    SubmissionStatus.DRAFT.value,
+    SubmissionStatus.PENDING_PAYMENT.value,
+})
+_FINAL_STATUSES = frozenset({
+    SubmissionStatus.SUBMITTED.value,
+    SubmissionStatus.UNDER_REVIEW.value,
+    SubmissionStatus.WINNER.value,
+})
+
 
 async def get_current_user_obj(
     current_user: dict = Depends(get_current_user),
@@ -37,8 +58,7 @@ async def get_current_user_obj(
     Dependency to get the current user as a User object.
     Raises 404 if user not found.
     """
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, int(current_user["user_id"]))
 
     if not user:
         raise HTTPException(
@@ -49,6 +69,181 @@ async def get_current_user_obj(
     return user
 
 
+def _submission_with_relations(submission_id: int):
+    """
+    Select a submission by ID with its user and competition eagerly loaded.
+    Any other relationship raises on access instead of lazy loading.
+
+    Built with lambda_stmt so the statement is constructed once per process;
+    later calls only re-bind submission_id.
+    """
+    return lambda_stmt(
+        lambda: select(Submission)
+        .options(
+            selectinload(Submission.user),
+            selectinload(Submission.competition),
+            raiseload("*"),
+        )
+        .where(Submission.id == submission_id)
+    )
+
+
+def _index_attachments(attachments: Optional[list]) -> dict:
+    """
+    Index a submission's attachments by type in a single pass.
+
+    Returns:
+        {type: (position in the list, attachment)}; the first attachment of
+        each type wins, as the list scans it replaces did
+    """
+    index = {}
+    for i, attachment in enumerate(attachments or ()):
+        index.setdefault(attachment.get("type"), (i, attachment))
+    return index
+
+
+async def _complete_entry_fee_payment(
+    db: AsyncSession,
+    payment_id: int,
+    competition_id: int,
+):
+    """
+    Mark an entry fee payment completed and credit its competition, atomically.
+
+    Used when Stripe reports success before the webhook has run. The payment
+    only transitions if it is not already completed, so the webhook and this
+    path can never both count the same entry (the webhook holds the payment
+    row lock while it works). current_entries and prize_pool are incremented
+    in the database, with no read-modify-write in Python.
+
+    Returns:
+        The competition's new (current_entries, prize_pool) row, or None if
+        the payment was already completed (nothing changed)
+    """
+    result = await db.execute(
+        update(Payment)
+        .where(
+            Payment.id == payment_id,
+            Payment.status != PaymentStatus.COMPLETED.value,
+        )
+        .values(status=PaymentStatus.COMPLETED.value, processed_at=utc_now())
+        .returning(Payment.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        return None
+
+    result = await db.execute(
+        update(Competition)
+        .where(Competition.id == competition_id)
+        .values(
+            current_entries=Competition.current_entries + 1,
+            prize_pool=Competition.prize_pool + (
+                Competition.entry_fee_cents - Competition.platform_fee_cents
+            ) / 100,
+        )
+        .returning(Competition.current_entries, Competition.prize_pool)
+        .execution_options(synchronize_session=False)
+    )
+    return result.one()
+
+
+async def _resolve_existing_submission(
+    db: AsyncSession,
+    competition_id: int,
+    user_id: int,
+    requested_status: SubmissionStatus,
+) -> SubmissionResponse:
+    """
+    Answer a create that hit uq_submissions_user_competition_active.
+
+    When the user is submitting and their existing entry is still waiting on
+    its entry fee, that entry is returned again with the pending
+    PaymentIntent's client secret. Any other existing entry is a duplicate.
+
+    Raises:
+        HTTPException: If the existing entry cannot be resumed
+    """
+    result = await db.execute(
+        select(Submission)
+        .options(
+            selectinload(Submission.payments.and_(Payment.type == PaymentType.ENTRY_FEE)),
+            selectinload(Submission.user),
+            selectinload(Submission.competition),
+            raiseload("*"),
+        )
+        .where(
+            Submission.competition_id == competition_id,
+            Submission.user_id == user_id,
+            Submission.status.in_([
+                SubmissionStatus.DRAFT,
+                SubmissionStatus.PENDING_PAYMENT,
+                SubmissionStatus.SUBMITTED,
+                SubmissionStatus.UNDER_REVIEW,
+                SubmissionStatus.WINNER
+            ])
+        )
+        # The rollback expired the user and competition already in the session
+        .execution_options(populate_existing=True)
+    )
+    existing_submission = result.scalar_one_or_none()
+
+    if existing_submission is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You already have a submission for this competition",
+        )
+
+    # Check if user already has a fully submitted submission for this competition
+    if existing_submission.status in _FINAL_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already submitted an entry for this competition",
+        )
+
+    if requested_status != SubmissionStatus.SUBMITTED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You already have a submission for this competition",
+        )
+
+    # Find the existing entry fee payment (only those are loaded)
+    existing_payment = max(
+        existing_submission.payments, key=lambda p: p.created_at, default=None
+    )
+
+    if not existing_payment or existing_payment.status != PaymentStatus.PENDING:
+        # Submission exists but no pending payment - shouldn't happen
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"You already have a submission (ID: {existing_submission.id}) for this competition. Please contact support."
+        )
+
+    # Use the client_secret stored at creation; retrieve the PaymentIntent
+    # from Stripe only for older rows without one
+    try:
+        client_secret = existing_payment.stripe_client_secret
+        if client_secret is None:
+            payment_intent = await call_stripe(
+                stripe.PaymentIntent.retrieve,
+                existing_payment.stripe_payment_intent_id,
+            )
+            client_secret = payment_intent.client_secret
+
+    except stripe.error.StripeError as e:
+        # If we can't retrieve the payment intent, raise error
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve existing payment intent: {str(e)}"
+        )
+
+    # Convert to response model and add payment secret
+    return SubmissionResponse.from_orm_trusted(
+        existing_submission,
+        payment_intent_client_secret=client_secret,
+    )
+
+
 @router.post("/", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED)
 async def create_submission(
     submission_data: SubmissionCreate,
@@ -72,10 +267,7 @@ async def create_submission(
       (this happens when payment is confirmed via webhook)
     """
     # Fetch competition
-    result = await db.execute(
-        select(Competition).where(Competition.id == submission_data.competition_id)
-    )
-    competition = result.scalar_one_or_none()
+    competition = await db.get(Competition, submission_data.competition_id)
 
     if not competition:
         raise HTTPException(
@@ -90,87 +282,6 @@ async def create_submission(
             detail=f"Competition is not active. Current status: {competition.status}",
         )
 
-    # Check if user already has a pending submission for this competition
-    if submission_data.status == SubmissionStatus.SUBMITTED:
-        existing_submission_result = await db.execute(
-            select(Submission)
-            .options(selectinload(Submission.payments))
-            .where(
-                Submission.competition_id == submission_data.competition_id,
-                Submission.user_id == current_user.id,
-                Submission.status.in_([
-                    SubmissionStatus.DRAFT,
-                    SubmissionStatus.PENDING_PAYMENT
-                ])
-            )
-        )
-        existing_submission = existing_submission_result.scalar_one_or_none()
-
-        if existing_submission:
-            # Find the existing payment
-            existing_payment = None
-            for payment in existing_submission.payments:
-                if payment.type == PaymentType.ENTRY_FEE:
-                    existing_payment = payment
-                    break
-
-            if existing_payment and existing_payment.status == PaymentStatus.PENDING:
-                # Retrieve the PaymentIntent from Stripe to get client_secret
-                try:
-                    payment_intent = stripe.PaymentIntent.retrieve(
-                        existing_payment.stripe_payment_intent_id
-                    )
-
-                    # Fetch the complete submission with relationships
-                    result = await db.execute(
-                        select(Submission)
-                        .options(
-                            selectinload(Submission.user),
-                            selectinload(Submission.competition)
-                        )
-                        .where(Submission.id == existing_submission.id)
-                    )
-                    complete_submission = result.scalar_one()
-
-                    # Convert to response model and add payment secret
-                    response_data = SubmissionResponse.model_validate(complete_submission)
-                    response_data.payment_intent_client_secret = payment_intent.client_secret
-
-                    return response_data
-
-                except stripe.error.StripeError as e:
-                    # If we can't retrieve the payment intent, raise error
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Failed to retrieve existing payment intent: {str(e)}"
-                    )
-            else:
-                # Submission exists but no pending payment - shouldn't happen
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"You already have a submission (ID: {existing_submission.id}) for this competition. Please contact support."
-                )
-
-    # Check if user already has a fully submitted submission for this competition
-    result = await db.execute(
-        select(Submission).where(
-            Submission.user_id == current_user.id,
-            Submission.competition_id == submission_data.competition_id,
-            Submission.status.in_([
-                SubmissionStatus.SUBMITTED,
-                SubmissionStatus.UNDER_REVIEW,
-                SubmissionStatus.WINNER
-            ])
-        )
-    )
-    existing_submission = result.scalar_one_or_none()
-
-    if existing_submission:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already submitted an entry for this competition",
-        )
-
     # If submitting (not draft), check competition is not full
     if submission_data.status == SubmissionStatus.SUBMITTED:
         if competition.current_entries >= competition.max_entries:
@@ -179,32 +290,72 @@ async def create_submission(
                 detail="Competition is full",
             )
 
-    # Create submission
+    # Create submission; user and competition are already loaded, so attach
+    # them directly instead of reloading the row with its relationships
     db_submission = Submission(
-        competition_id=submission_data.competition_id,
-        user_id=current_user.id,
+        competition=competition,
+        user=current_user,
         title=submission_data.title,
         description=submission_data.description,
-        status=submission_data.status.value,  # Extract lowercase enum value
+        status=submission_data.status,
     )
 
     db.add(db_submission)
 
-    await db.commit()
-    await db.refresh(db_submission)
-
-    # Fetch with relationships
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
+    # uq_submissions_user_competition_active allows one active entry per user
+    # and competition, so the INSERT doubles as the existence check.
+    # The INSERT returns the new id; every other column has a Python-side
+    # default, and expire_on_commit=False keeps them loaded after commit.
+    # A rollback expires every instance in the session (and an expired
+    # attribute can't be lazy-loaded here), so the user id is read beforehand
+    user_id = current_user.id
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return await _resolve_existing_submission(
+            db, submission_data.competition_id, user_id, submission_data.status
         )
-        .where(Submission.id == db_submission.id)
-    )
-    submission = result.scalar_one()
 
-    return SubmissionResponse.model_validate(submission)
+    return SubmissionResponse.from_orm_trusted(db_submission)
+
+
+def _decimal_str(value: Optional[Decimal]) -> Optional[str]:
+    """Decimal as Pydantic serializes it to JSON (a string)."""
+    return str(value) if value is not None else None
+
+
+def _submission_list_item(submission: Submission, image_urls: dict) -> dict:
+    """Build one SubmissionListResponse-shaped dict from a loaded Submission."""
+    user = submission.user
+    competition = submission.competition
+    return {
+        "id": submission.id,
+        "competition_id": submission.competition_id,
+        "user_id": submission.user_id,
+        "title": submission.title,
+        "description": submission.description,
+        "status": submission.status.value,
+        "is_public": submission.is_public,
+        "placement": submission.placement,
+        "final_score": _decimal_str(submission.final_score),
+        "submitted_at": submission.submitted_at,
+        "created_at": submission.created_at,
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+        },
+        "competition": {
+            "id": competition.id,
+            "title": competition.title,
+            "domain": competition.domain,
+            "status": competition.status.value,
+            "image_url": image_urls.get(competition.id, competition.image_url),
+            "prize_pool": _decimal_str(competition.prize_pool),
+            "prize_structure": competition.prize_structure,
+        },
+    }
 
 
 @router.get("/", response_model=list[SubmissionListResponse])
@@ -216,13 +367,15 @@ async def list_submissions(
     """
     List current user's submissions.
 
-    Optional filter by competition_id.
+    Optional filter by competition_id. The response is built directly with
+    orjson; response_model is kept for the OpenAPI schema.
     """
     query = (
         select(Submission)
         .options(
             selectinload(Submission.user),
             selectinload(Submission.competition),
+            raiseload("*"),
         )
         .where(Submission.user_id == current_user.id)
     )
@@ -236,19 +389,26 @@ async def list_submissions(
     result = await db.execute(query)
     submissions = result.scalars().all()
 
-    # Generate fresh presigned URLs for competition images
+    # Generate presigned URLs for competition images, once per competition
+    # (submissions to the same competition share one loaded Competition)
+    image_urls = {}
     for submission in submissions:
-        if submission.competition and submission.competition.image_key:
+        competition = submission.competition
+        if competition and competition.image_key and competition.id not in image_urls:
             try:
-                submission.competition.image_url = generate_presigned_url(
-                    submission.competition.image_key,
+                image_urls[competition.id] = get_cached_presigned_url(
+                    competition.image_key,
                     expiration=604800  # 7 days
                 )
             except Exception as e:
-                logger.error(f"Failed to generate presigned URL for competition {submission.competition.id}: {e}")
+                logger.error(f"Failed to generate presigned URL for competition {competition.id}: {e}")
                 # Leave the existing image_url as-is if generation fails
 
-    return submissions
+    # Serialize directly; the rows come from the database, so the
+    # SubmissionListResponse validation pass is skipped
+    return ORJSONResponse([
+        _submission_list_item(submission, image_urls) for submission in submissions
+    ])
 
 
 @router.get("/{submission_id}", response_model=SubmissionResponse)
@@ -264,14 +424,7 @@ async def get_submission(
     Returns 404 if submission not found.
     Returns 403 if user is not authorized to view this submission.
     """
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
-        .where(Submission.id == submission_id)
-    )
+    result = await db.execute(_submission_with_relations(submission_id))
     submission = result.scalar_one_or_none()
 
     if not submission:
@@ -312,14 +465,7 @@ async def update_submission(
       (this happens when payment is confirmed via webhook)
     """
     # Fetch submission
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
-        .where(Submission.id == submission_id)
-    )
+    result = await db.execute(_submission_with_relations(submission_id))
     submission = result.scalar_one_or_none()
 
     if not submission:
@@ -338,7 +484,7 @@ async def update_submission(
     # Check if submission is already submitted (non-admin can't edit)
     # Allow editing of DRAFT and PENDING_PAYMENT submissions
     if (
-        submission.status not in [SubmissionStatus.DRAFT, SubmissionStatus.PENDING_PAYMENT]
+        submission.status not in _EDITABLE_STATUSES
         and not current_user.is_superuser
     ):
         raise HTTPException(
@@ -352,7 +498,7 @@ async def update_submission(
     # Check if status is changing from draft/pending_payment to submitted
     status_changing_to_submitted = (
         "status" in update_data
-        and submission.status in [SubmissionStatus.DRAFT, SubmissionStatus.PENDING_PAYMENT]
+        and submission.status in _EDITABLE_STATUSES
         and update_data["status"] == SubmissionStatus.SUBMITTED
     )
 
@@ -360,11 +506,8 @@ async def update_submission(
     payment_intent_client_secret = None
 
     if status_changing_to_submitted:
-        # Fetch competition to check capacity
-        result = await db.execute(
-            select(Competition).where(Competition.id == submission.competition_id)
-        )
-        competition = result.scalar_one()
+        # Competition was loaded with the submission above
+        competition = submission.competition
 
         # Check competition is not full
         if competition.current_entries >= competition.max_entries:
@@ -393,45 +536,36 @@ async def update_submission(
         if existing_payment and existing_payment.stripe_payment_intent_id:
             try:
                 # Query Stripe for actual payment status
-                stripe_intent = stripe.PaymentIntent.retrieve(
-                    existing_payment.stripe_payment_intent_id
+                stripe_intent = await call_stripe(
+                    stripe.PaymentIntent.retrieve,
+                    existing_payment.stripe_payment_intent_id,
                 )
 
                 # CASE A: Payment already succeeded (webhook failed to update DB)
                 if stripe_intent.status == 'succeeded':
                     logger.info(f"Payment {existing_payment.id} already succeeded in Stripe, syncing DB")
 
-                    # Update our DB to match Stripe reality
-                    existing_payment.status = PaymentStatus.COMPLETED.value
-                    existing_payment.processed_at = datetime.utcnow()
+                    # Update our DB to match Stripe reality, and competition
+                    # stats (since webhook didn't run)
+                    updated = await _complete_entry_fee_payment(db, existing_payment.id, competition.id)
+                    if updated:
+                        # Keep the loaded competition in step for the response
+                        set_committed_value(competition, "current_entries", updated.current_entries)
+                        set_committed_value(competition, "prize_pool", updated.prize_pool)
 
-                    update_data["status"] = SubmissionStatus.SUBMITTED.value
+                    update_data["status"] = SubmissionStatus.SUBMITTED
                     update_data["submitted_at"] = datetime.utcnow()
 
-                    # Update competition stats (since webhook didn't run)
-                    platform_fee = competition.entry_fee * (competition.platform_fee_percentage / 100)
-                    competition.current_entries += 1
-                    competition.prize_pool += (competition.entry_fee - platform_fee)
-
-                    # Apply updates and commit
+                    # Apply updates and commit; payment and competition were
+                    # already written by Core UPDATEs, so this flushes a
+                    # single UPDATE for the submission
                     for field, value in update_data.items():
                         setattr(submission, field, value)
 
                     await db.commit()
-                    await db.refresh(submission)
-
-                    # Fetch with relationships for response
-                    result = await db.execute(
-                        select(Submission)
-                        .options(
-                            selectinload(Submission.user),
-                            selectinload(Submission.competition),
-                        )
-                        .where(Submission.id == submission.id)
-                    )
-                    submission = result.scalar_one()
 
-                    return submission
+                    # User and competition were loaded with the submission
+                    return SubmissionResponse.from_orm_trusted(submission)
 
                 # CASE B: Payment requires new payment method (failed/cancelled)
                 elif stripe_intent.status in ['requires_payment_method', 'canceled']:
@@ -445,7 +579,7 @@ async def update_submission(
                     payment_intent_client_secret = stripe_intent.client_secret
 
                     # Set status to PENDING_PAYMENT
-                    update_data["status"] = SubmissionStatus.PENDING_PAYMENT.value
+                    update_data["status"] = SubmissionStatus.PENDING_PAYMENT
                     update_data["submitted_at"] = datetime.utcnow()
 
                     # Don't create new payment record, use existing
@@ -458,10 +592,11 @@ async def update_submission(
 
         # STEP 3: Create new payment intent (only if no active payment exists)
         if payment_intent_client_secret is None:
-            amount_cents = int(competition.entry_fee * 100)
+            amount_cents = competition.entry_fee_cents
 
             try:
-                payment_intent = create_payment_intent(
+                payment_intent = await call_stripe(
+                    create_payment_intent,
                     amount=amount_cents,
                     currency="usd",
                     metadata={
@@ -469,12 +604,13 @@ async def update_submission(
                         "competition_id": str(competition.id),
                         "submission_id": str(submission.id),
                         "type": "entry_fee",
-                    }
+                    },
+                    idempotency_key=new_idempotency_key(),
                 )
                 payment_intent_client_secret = payment_intent.client_secret
 
                 # Set status to PENDING_PAYMENT (NOT SUBMITTED)
-                update_data["status"] = SubmissionStatus.PENDING_PAYMENT.value
+                update_data["status"] = SubmissionStatus.PENDING_PAYMENT
                 update_data["submitted_at"] = datetime.utcnow()
 
                 # Create Payment record
@@ -484,6 +620,7 @@ async def update_submission(
                     competition_id=competition.id,
                     amount=competition.entry_fee,
                     stripe_payment_intent_id=payment_intent.id,
+                    stripe_client_secret=payment_intent.client_secret,
                     status=PaymentStatus.PENDING.value,  # Extract lowercase enum value
                     type=PaymentType.ENTRY_FEE.value  # Extract lowercase enum value
                 )
@@ -503,26 +640,23 @@ async def update_submission(
     for field, value in update_data.items():
         setattr(submission, field, value)
 
-    await db.commit()
-    await db.refresh(submission)
-
-    # Fetch with relationships
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
+    # Moving an entry back to an active status can collide with another
+    # active entry for the same competition (uq_submissions_user_competition_active)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You already have a submission for this competition",
         )
-        .where(Submission.id == submission.id)
-    )
-    submission = result.scalar_one()
-
-    # Convert to response model and add payment secret if present
-    response_data = SubmissionResponse.model_validate(submission)
-    if payment_intent_client_secret:
-        response_data.payment_intent_client_secret = payment_intent_client_secret
 
-    return response_data
+    # Convert to response model and add payment secret if present; user and
+    # competition are still loaded from the query at the top
+    return SubmissionResponse.from_orm_trusted(
+        submission,
+        payment_intent_client_secret=payment_intent_client_secret or None,
+    )
 
 
 @router.post("/{submission_id}/create-payment-intent")
@@ -541,10 +675,7 @@ async def create_submission_payment_intent(
     3. Updates submission status to PENDING_PAYMENT
     """
     # Fetch submission
-    result = await db.execute(
-        select(Submission).where(Submission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    submission = await db.get(Submission, submission_id)
 
     if not submission:
         raise HTTPException(
@@ -567,10 +698,7 @@ async def create_submission_payment_intent(
         )
 
     # Get competition
-    result = await db.execute(
-        select(Competition).where(Competition.id == submission.competition_id)
-    )
-    competition = result.scalar_one_or_none()
+    competition = await db.get(Competition, submission.competition_id)
 
     if not competition:
         raise HTTPException(
@@ -579,10 +707,11 @@ async def create_submission_payment_intent(
         )
 
     # Create Stripe payment intent
-    amount_cents = int(competition.entry_fee * 100)
+    amount_cents = competition.entry_fee_cents
 
     try:
-        payment_intent = create_payment_intent(
+        payment_intent = await call_stripe(
+            create_payment_intent,
             amount=amount_cents,
             currency="usd",
             metadata={
@@ -590,7 +719,8 @@ async def create_submission_payment_intent(
                 "competition_id": str(competition.id),
                 "submission_id": str(submission.id),
                 "type": "entry_fee",
-            }
+            },
+            idempotency_key=new_idempotency_key(),
         )
     except Exception as e:
         logger.error(f"Stripe error creating payment intent: {str(e)}")
@@ -608,6 +738,7 @@ async def create_submission_payment_intent(
         type=PaymentType.ENTRY_FEE.value,  # Extract lowercase enum value
         status=PaymentStatus.PENDING.value,  # Extract lowercase enum value
         stripe_payment_intent_id=payment_intent.id,
+        stripe_client_secret=payment_intent.client_secret,
     )
     db.add(db_payment)
 
@@ -623,24 +754,89 @@ async def create_submission_payment_intent(
     return {"client_secret": payment_intent.client_secret}
 
 
+async def reconcile_payment(payment_id: int) -> None:
+    """
+    Bring a pending entry fee payment in line with its Stripe PaymentIntent.
+
+    Scheduled by check-payment-status after the response is sent, so it opens
+    its own database session. The Stripe webhook usually does the same work
+    first; the guarded UPDATEs make whichever path runs second a no-op.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            payment = await db.get(Payment, payment_id)
+            if (
+                not payment
+                or payment.status != PaymentStatus.PENDING
+                or not payment.stripe_payment_intent_id
+            ):
+                return
+
+            payment_intent = await call_stripe(get_payment_intent, payment.stripe_payment_intent_id)
+
+            if payment_intent.status == "succeeded":
+                # Update payment to COMPLETED and competition stats (since webhook didn't fire)
+                if await _complete_entry_fee_payment(db, payment.id, payment.competition_id) is None:
+                    return
+
+                # Update submission to SUBMITTED
+                await db.execute(
+                    update(Submission)
+                    .where(Submission.id == payment.submission_id)
+                    .values(
+                        status=SubmissionStatus.SUBMITTED.value,
+                        submitted_at=func.coalesce(Submission.submitted_at, utc_now()),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+
+                logger.info(
+                    f"Payment confirmed for submission {payment.submission_id}. Updated to SUBMITTED."
+                )
+
+            elif payment_intent.status == "canceled":
+                # Update payment to FAILED
+                await db.execute(
+                    update(Payment)
+                    .where(
+                        Payment.id == payment.id,
+                        Payment.status == PaymentStatus.PENDING.value,
+                    )
+                    .values(status=PaymentStatus.FAILED.value, processed_at=utc_now())
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+    except Exception as e:
+        # The response has already been sent; the next status check or the
+        # webhook will pick the payment up again
+        logger.error(f"Error reconciling payment {payment_id}: {str(e)}", exc_info=True)
+
+
 @router.post("/{submission_id}/check-payment-status")
 async def check_submission_payment_status(
     submission_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user_obj),
 ):
     """
-    Check payment status with Stripe for a PENDING_PAYMENT submission.
+    Check payment status for a PENDING_PAYMENT submission.
     Called when user clicks 'Check Payment Status' button.
 
     This:
-    1. Queries Stripe API for payment intent status
-    2. If payment succeeded, updates submission to SUBMITTED and payment to COMPLETED
-    3. Returns current status to frontend
+    1. Returns the payment status currently recorded in the database
+    2. If the payment is still pending, schedules reconcile_payment to ask
+       Stripe after the response is sent (the webhook normally gets there first)
     """
-    # Fetch submission
+    # Fetch submission with its entry fee payments in one go
     result = await db.execute(
-        select(Submission).where(Submission.id == submission_id)
+        select(Submission)
+        .options(
+            selectinload(Submission.payments.and_(Payment.type == PaymentType.ENTRY_FEE)),
+            raiseload("*"),
+        )
+        .where(Submission.id == submission_id)
     )
     submission = result.scalar_one_or_none()
 
@@ -657,21 +853,16 @@ async def check_submission_payment_status(
             detail="Not authorized to access this submission"
         )
 
-    # Submission must be PENDING_PAYMENT status
-    if submission.status != SubmissionStatus.PENDING_PAYMENT:
+    # Submission must be PENDING_PAYMENT status, or SUBMITTED once a
+    # previous check's reconciliation has completed it
+    if submission.status not in (SubmissionStatus.PENDING_PAYMENT, SubmissionStatus.SUBMITTED):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot check payment status. Submission status is: {submission.status}"
         )
 
-    # Get associated payment record
-    result = await db.execute(
-        select(Payment).where(
-            Payment.submission_id == submission_id,
-            Payment.type == PaymentType.ENTRY_FEE
-        )
-    )
-    payment = result.scalar_one_or_none()
+    # Get associated payment record (the latest, if a retry created another)
+    payment = max(submission.payments, key=lambda p: p.created_at, default=None)
 
     if not payment:
         raise HTTPException(
@@ -679,101 +870,53 @@ async def check_submission_payment_status(
             detail="Payment record not found for this submission"
         )
 
-    if not payment.stripe_payment_intent_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No Stripe payment intent ID found"
-        )
-
-    # Query Stripe for payment intent status
-    try:
-        payment_intent = get_payment_intent(payment.stripe_payment_intent_id)
-    except Exception as e:
-        logger.error(f"Error retrieving payment intent from Stripe: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to check payment status with Stripe"
-        )
-
-    # Check if payment succeeded in Stripe
-    if payment_intent.status == "succeeded":
-        # Update submission to SUBMITTED
-        submission.status = SubmissionStatus.SUBMITTED.value
-        if not submission.submitted_at:
-            submission.submitted_at = datetime.utcnow()
-
-        # Update payment to COMPLETED
-        payment.status = PaymentStatus.COMPLETED.value
-
-        # Update competition stats (since webhook didn't fire)
-        result = await db.execute(
-            select(Competition).where(Competition.id == submission.competition_id)
-        )
-        competition = result.scalar_one()
-
-        # Calculate platform fee and prize pool contribution
-        platform_fee = competition.entry_fee * (competition.platform_fee_percentage / 100)
-        prize_contribution = competition.entry_fee - platform_fee
-
-        # Update competition stats
-        competition.current_entries += 1
-        competition.prize_pool += prize_contribution
-
-        # Commit all changes
-        await db.commit()
-
-        logger.info(f"Payment confirmed for submission {submission_id}. Updated to SUBMITTED.")
-
+    if payment.status == PaymentStatus.COMPLETED:
         return {
             "submission_status": "submitted",
             "payment_status": "completed",
             "message": "Payment confirmed! Your submission is complete."
         }
 
-    elif payment_intent.status == "requires_payment_method":
+    if payment.status == PaymentStatus.FAILED:
         return {
             "submission_status": "pending_payment",
-            "payment_status": "pending",
-            "message": "Payment not yet completed. Please complete payment on the payment page."
+            "payment_status": "failed",
+            "message": "Payment was canceled. Please create a new payment."
         }
 
-    elif payment_intent.status == "processing":
-        return {
-            "submission_status": "pending_payment",
-            "payment_status": "pending",
-            "message": "Payment is being processed. Please check again in a few moments."
-        }
+    if not payment.stripe_payment_intent_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No Stripe payment intent ID found"
+        )
 
-    elif payment_intent.status in ["requires_action", "requires_confirmation"]:
-        return {
-            "submission_status": "pending_payment",
-            "payment_status": "pending",
-            "message": "Payment requires additional action. Please complete payment on the payment page."
-        }
+    # Ask Stripe after responding, in case the webhook hasn't arrived yet
+    background_tasks.add_task(reconcile_payment, payment.id)
 
-    elif payment_intent.status == "canceled":
-        # Update payment to FAILED
-        payment.status = PaymentStatus.FAILED.value
-        await db.commit()
+    return {
+        "submission_status": "pending_payment",
+        "payment_status": "pending",
+        "message": "Payment is being verified. Please check again in a few moments."
+    }
 
-        return {
-            "submission_status": "pending_payment",
-            "payment_status": "failed",
-            "message": "Payment was canceled. Please create a new payment."
-        }
 
-    else:
-        # Other statuses (failed, requires_capture, etc.)
-        return {
-            "submission_status": "pending_payment",
-            "payment_status": "pending",
-            "message": f"Payment status: {payment_intent.status}. Please contact support if this persists."
-        }
+def _delete_old_video(s3_key: str) -> None:
+    """
+    Delete a replaced submission video from S3.
+
+    Runs as a background task once the new video is saved; failures are
+    only logged, since the submission no longer references the old file.
+    """
+    try:
+        delete_file(s3_key)
+    except Exception as e:
+        logger.warning(f"Failed to delete old video {s3_key}: {str(e)}")
 
 
 @router.post("/{submission_id}/video", response_model=SubmissionResponse)
 async def upload_submission_video(
     submission_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user_obj),
@@ -790,14 +933,7 @@ async def upload_submission_video(
     Returns the updated submission.
     """
     # Fetch submission
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
-        .where(Submission.id == submission_id)
-    )
+    result = await db.execute(_submission_with_relations(submission_id))
     submission = result.scalar_one_or_none()
 
     if not submission:
@@ -814,28 +950,16 @@ async def upload_submission_video(
         )
 
     # Check submission status is draft or pending_payment
-    if submission.status not in [SubmissionStatus.DRAFT, SubmissionStatus.PENDING_PAYMENT]:
+    if submission.status not in _EDITABLE_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot upload video to submission with status: {submission.status}",
         )
 
-    # Delete old video from S3 if it exists
-    if submission.attachments:
-        for attachment in submission.attachments:
-            if attachment.get("type") == "video":
-                old_s3_key = attachment.get("s3_key")
-                if old_s3_key:
-                    try:
-                        delete_file(old_s3_key)
-                    except Exception as e:
-                        # Log error but don't fail the upload if old file doesn't exist
-                        if settings.debug:
-                            print(f"Warning: Failed to delete old video {old_s3_key}: {str(e)}")
-                break
+    existing_video = _index_attachments(submission.attachments).get("video")
 
     # Upload video to S3
-    s3_key, s3_url = upload_video(
+    s3_key, s3_url = await upload_video_async(
         file=file,
         user_id=current_user.id,
         submission_id=submission_id
@@ -853,16 +977,10 @@ async def upload_submission_video(
         "uploaded_at": datetime.utcnow().isoformat(),
     }
 
-    # Check if a video already exists in attachments and replace it
-    video_exists = False
-    for i, attachment in enumerate(submission.attachments):
-        if attachment.get("type") == "video":
-            submission.attachments[i] = video_info
-            video_exists = True
-            break
-
-    # If no video exists, append the new one
-    if not video_exists:
+    # Replace the existing video in place, or append the new one
+    if existing_video:
+        submission.attachments[existing_video[0]] = video_info
+    else:
         submission.attachments.append(video_info)
 
     # Mark as modified for SQLAlchemy to detect change
@@ -870,20 +988,17 @@ async def upload_submission_video(
     flag_modified(submission, "attachments")
 
     await db.commit()
-    await db.refresh(submission)
 
-    # Fetch with relationships
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
-        .where(Submission.id == submission.id)
-    )
-    submission = result.scalar_one()
+    # Delete old video from S3 after the response is sent. The key only
+    # changes with the file extension; an identical key was just overwritten
+    if existing_video:
+        old_s3_key = existing_video[1].get("s3_key")
+        if old_s3_key and old_s3_key != s3_key:
+            background_tasks.add_task(_delete_old_video, old_s3_key)
 
-    return submission
+    # User and competition were loaded with the submission; expire_on_commit
+    # is off, so nothing needs reloading
+    return SubmissionResponse.from_orm_trusted(submission)
 
 
 @router.get("/{submission_id}/video-url")
@@ -902,16 +1017,13 @@ async def get_submission_video_url(
 
     Returns a temporary presigned URL valid for 1 hour.
     """
-    # Fetch submission
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
+    # Fetch only the columns this needs (built once, as a lambda_stmt); the
+    # row reads like the submission
+    result = await db.execute(lambda_stmt(
+        lambda: select(Submission.user_id, Submission.attachments)
         .where(Submission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    ))
+    submission = result.one_or_none()
 
     if not submission:
         raise HTTPException(
@@ -931,12 +1043,7 @@ async def get_submission_video_url(
         )
 
     # Find video attachment in attachments list
-    video_attachment = None
-    if submission.attachments:
-        for attachment in submission.attachments:
-            if attachment.get("type") == "video":
-                video_attachment = attachment
-                break
+    _, video_attachment = _index_attachments(submission.attachments).get("video", (None, None))
 
     if not video_attachment:
         raise HTTPException(
@@ -952,13 +1059,12 @@ async def get_submission_video_url(
             detail="Video attachment is missing s3_key",
         )
 
-    # Generate presigned URL
-    expiration = 3600  # 1 hour
-    video_url = generate_presigned_url(s3_key=s3_key, expiration=expiration)
+    # Presigned URL, reused while it has enough lifetime left
+    video_url, expires_in = get_cached_presigned_url_with_expiry(s3_key=s3_key, expiration=3600)
 
     return {
         "video_url": video_url,
-        "expires_in": expiration,
+        "expires_in": expires_in,
     }
 
 
@@ -976,10 +1082,7 @@ async def delete_submission(
     Returns 204 on success.
     """
     # Fetch submission
-    result = await db.execute(
-        select(Submission).where(Submission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    submission = await db.get(Submission, submission_id)
 
     if not submission:
         raise HTTPException(
@@ -1025,14 +1128,7 @@ async def get_public_submission(
     - 403 if submission is not public
     """
     # Fetch submission with relationships
-    result = await db.execute(
-        select(Submission)
-        .options(
-            selectinload(Submission.user),
-            selectinload(Submission.competition),
-        )
-        .where(Submission.id == submission_id)
-    )
+    result = await db.execute(_submission_with_relations(submission_id))
     submission = result.scalar_one_or_none()
 
     if not submission:
@@ -1068,11 +1164,13 @@ async def get_public_submission_video(
     - 404 if submission not found or no video attached
     - 403 if submission is not public
     """
-    # Fetch submission
-    result = await db.execute(
-        select(Submission).where(Submission.id == submission_id)
-    )
-    submission = result.scalar_one_or_none()
+    # Fetch only the columns this needs (built once, as a lambda_stmt); the
+    # row reads like the submission
+    result = await db.execute(lambda_stmt(
+        lambda: select(Submission.is_public, Submission.attachments)
+        .where(Submission.id == submission_id)
+    ))
+    submission = result.one_or_none()
 
     if not submission:
         raise HTTPException(
@@ -1088,12 +1186,7 @@ async def get_public_submission_video(
         )
 
     # Find video attachment in attachments list
-    video_attachment = None
-    if submission.attachments:
-        for attachment in submission.attachments:
-            if attachment.get("type") == "video":
-                video_attachment = attachment
-                break
+    _, video_attachment = _index_attachments(submission.attachments).get("video", (None, None))
 
     if not video_attachment:
         raise HTTPException(
@@ -1109,11 +1202,10 @@ async def get_public_submission_video(
             detail="Video attachment is missing s3_key",
         )
 
-    # Generate presigned URL
-    expiration = 3600  # 1 hour
-    video_url = generate_presigned_url(s3_key=s3_key, expiration=expiration)
+    # Presigned URL, reused while it has enough lifetime left
+    video_url, expires_in = get_cached_presigned_url_with_expiry(s3_key=s3_key, expiration=3600)
 
     return {
         "video_url": video_url,
-        "expires_in": expiration,
+        "expires_in": expires_in,
     }
@@ -1,25 +1,92 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from typing import BinaryIO, List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, or_
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserUpdateAdmin
-from app.core.security import get_password_hash, verify_password, get_current_user, get_current_user_obj, require_role
+from app.core.security import get_password_hash, verify_password, get_current_user_obj, require_role
 from app.services.email_service import send_email_change_notification
-from app.core.s3_service import generate_presigned_url
+from app.core.s3_service import s3_client, generate_image_url
 from app.config import get_settings
 from PIL import Image
+import asyncio
 import io
+import tempfile
 import uuid
-import boto3
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Bound once at import; the avatar endpoints read it on every request
+_S3_BUCKET = settings.aws_s3_bucket
+
 router = APIRouter()
 
+# The User columns UserResponse is built from (is_superuser derives from role)
+_USER_RESPONSE_COLUMNS = (
+    User.id,
+    User.email,
+    User.username,
+    User.is_active,
+    User.role,
+    User.created_at,
+    User.updated_at,
+    User.avatar_url,
+    User.stripe_connect_account_id,
+    User.connect_onboarding_complete,
+    User.connect_charges_enabled,
+    User.connect_payouts_enabled,
+    User.connect_onboarded_at,
+)
+
+# Avatar uploads are spooled in chunks: up to AVATAR_SPOOL_MAX_MEMORY stays
+# in memory, the rest goes to a temp file, and anything over MAX_AVATAR_SIZE
+# is rejected
+MAX_AVATAR_SIZE = 10 * 1024 * 1024  # 10MB
+AVATAR_SPOOL_MAX_MEMORY = 2 * 1024 * 1024  # 2MB
+AVATAR_READ_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+async def check_user_conflicts(
+    db: AsyncSession,
+    emails: List[str],
+    usernames: List[str],
+) -> dict:
+    """
+    Find which of the given emails and usernames are already taken.
+
+    Issues a single query however many values are passed (none if both lists
+    are empty), so bulk callers such as admin imports don't check users one
+    at a time. Values are compared as stored, so pass them lowercased.
+
+    Returns:
+        {"emails": set of taken emails, "usernames": set of taken usernames}
+    """
+    conflicts = {"emails": set(), "usernames": set()}
+
+    conditions = []
+    if emails:
+        conditions.append(User.email.in_(emails))
+    if usernames:
+        conditions.append(User.username.in_(usernames))
+    if not conditions:
+        return conflicts
+
+    result = await db.execute(select(User.email, User.username).where(or_(*conditions)))
+
+    wanted_emails = set(emails)
+    wanted_usernames = set(usernames)
+    for email, username in result:
+        if email in wanted_emails:
+            conflicts["emails"].add(email)
+        if username in wanted_usernames:
+            conflicts["usernames"].add(username)
+
+    return conflicts
+
 
 @router.get("/", response_model=List[UserResponse])
 async def list_users(
@@ -30,7 +97,9 @@ async def list_users(
     """
     List all users. Optionally filter by role.
 
-    Admin only endpoint.
+    Admin only endpoint. Only the columns UserResponse needs are selected and
+    the response is built directly with orjson; response_model is kept for
+    the OpenAPI schema.
     """
     # Only admins can list users
     if current_user.role != UserRole.ADMIN:
@@ -39,35 +108,36 @@ async def list_users(
             detail="Only admins can list users"
         )
 
-    query = select(User)
+    query = select(*_USER_RESPONSE_COLUMNS)
 
     if role:
         query = query.where(User.role == role)
 
     result = await db.execute(query)
-    users = result.scalars().all()
 
-    # Generate fresh presigned URLs for avatars
+    # Avatar URLs: CloudFront URLs that stay identical all day (so browsers
+    # cache the images), or reused presigned URLs without CloudFront
     user_responses = []
-    for user in users:
-        # Create UserResponse from the user object
-        user_response = UserResponse.model_validate(user)
+    for row in result.mappings():
+        user_response = dict(row)
+        user_response["role"] = row["role"].value
+        user_response["is_superuser"] = row["role"] == UserRole.ADMIN
 
         # Generate presigned URL if user has an avatar
-        if user.avatar_url:
+        if row["avatar_url"]:
             try:
-                user_response.avatar_url = generate_presigned_url(
-                    user.avatar_url,
+                user_response["avatar_url"] = generate_image_url(
+                    row["avatar_url"],
                     expiration=3600  # 1 hour
                 )
             except Exception as e:
-                logger.warning(f"Failed to generate presigned URL for user {user.id}: {str(e)}")
+                logger.warning(f"Failed to generate presigned URL for user {row['id']}: {str(e)}")
                 # Continue without avatar URL if generation fails
-                user_response.avatar_url = None
+                user_response["avatar_url"] = None
 
         user_responses.append(user_response)
 
-    return user_responses
+    return ORJSONResponse(user_responses)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -76,21 +146,20 @@ async def create_user(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new user."""
-    # Check for existing email (case-insensitive)
-    result = await db.execute(
-        select(User).where(func.lower(User.email) == user_data.email.lower())
-    )
-    if result.scalar_one_or_none():
+    email = user_data.email.lower()
+    username = user_data.username.lower()
+
+    # Check for existing email or username (case-insensitive, as both are
+    # stored lowercase)
+    conflicts = await check_user_conflicts(db, [email], [username])
+
+    if conflicts["emails"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    # Check for existing username (case-insensitive)
-    result = await db.execute(
-        select(User).where(func.lower(User.username) == user_data.username.lower())
-    )
-    if result.scalar_one_or_none():
+    if conflicts["usernames"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken",
@@ -98,8 +167,8 @@ async def create_user(
 
     hashed_password = get_password_hash(user_data.password)
     db_user = User(
-        email=user_data.email.lower(),  # Store email in lowercase
-        username=user_data.username.lower(),  # Store username in lowercase
+        email=email,  # Store email in lowercase
+        username=username,  # Store username in lowercase
         hashed_password=hashed_password,
         role=user_data.role.value,  # Extract lowercase enum value
     )
@@ -113,20 +182,10 @@ async def create_user(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_obj),
 ):
     """Get current user information."""
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    return user
+    return current_user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -135,8 +194,7 @@ async def get_user(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a user by ID."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -150,27 +208,18 @@ async def get_user(
 @router.patch("/me", response_model=UserResponse)
 async def update_current_user(
     user_data: UserUpdate,
-    current_user: dict = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_obj),
     db: AsyncSession = Depends(get_db),
 ):
     """Update current user information."""
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
     update_data = user_data.model_dump(exclude_unset=True)
 
     # Store old email for notification (before any changes)
-    old_email = user.email
+    old_email = current_user.email
     email_changed = False
 
     # If email is being changed, require password verification
-    if "email" in update_data and update_data["email"] != user.email:
+    if "email" in update_data and update_data["email"] != current_user.email:
         email_changed = True
         if "current_password" not in update_data or not update_data["current_password"]:
             raise HTTPException(
@@ -179,7 +228,7 @@ async def update_current_user(
             )
 
         # Verify the current password
-        if not verify_password(update_data["current_password"], user.hashed_password):
+        if not verify_password(update_data["current_password"], current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect",
@@ -191,47 +240,48 @@ async def update_current_user(
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
 
+    # Normalize email and username to lowercase, then check any that change
+    # against other accounts in one query (case-insensitive, as both are
+    # stored lowercase)
+    changed_emails = []
     if "email" in update_data:
-        # Check if new email is already taken (case-insensitive)
-        new_email = update_data["email"].lower()
-        if new_email != user.email.lower():
-            result = await db.execute(
-                select(User).where(func.lower(User.email) == new_email)
-            )
-            if result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered",
-                )
-        update_data["email"] = new_email  # Normalize email to lowercase
+        update_data["email"] = update_data["email"].lower()
+        if update_data["email"] != current_user.email:
+            changed_emails.append(update_data["email"])
 
+    changed_usernames = []
     if "username" in update_data:
-        # Check if new username is already taken (case-insensitive)
-        new_username = update_data["username"].lower()
-        if new_username != user.username.lower():
-            result = await db.execute(
-                select(User).where(func.lower(User.username) == new_username)
-            )
-            if result.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username already taken",
-                )
-        update_data["username"] = new_username  # Normalize username to lowercase
+        update_data["username"] = update_data["username"].lower()
+        if update_data["username"] != current_user.username:
+            changed_usernames.append(update_data["username"])
+
+    conflicts = await check_user_conflicts(db, changed_emails, changed_usernames)
+
+    if conflicts["emails"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
+    if conflicts["usernames"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already taken",
+        )
 
     for field, value in update_data.items():
-        setattr(user, field, value)
+        setattr(current_user, field, value)
 
     await db.commit()
-    await db.refresh(user)
+    await db.refresh(current_user)
 
     # Send email notification to old email address if email was changed
     if email_changed:
         try:
             await send_email_change_notification(
                 old_email=old_email,
-                new_email=user.email,
-                username=user.username
+                new_email=current_user.email,
+                username=current_user.username
             )
         except Exception as e:
             # Log error but don't fail the update if email notification fails
@@ -239,13 +289,87 @@ async def update_current_user(
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to send email change notification: {str(e)}")
 
-    return user
+    return current_user
+
+
+async def _spool_avatar_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy an avatar upload into a spooled temp file, enforcing MAX_AVATAR_SIZE.
+
+    Returns:
+        The spooled file, rewound; the caller closes it
+
+    Raises:
+        HTTPException: 413 if the upload is larger than MAX_AVATAR_SIZE
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=AVATAR_SPOOL_MAX_MEMORY)
+    size = 0
+    while chunk := await file.read(AVATAR_READ_CHUNK_SIZE):
+        size += len(chunk)
+        if size > MAX_AVATAR_SIZE:
+            spooled.close()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Image too large. Maximum size is 10MB.",
+            )
+        spooled.write(chunk)
+
+    spooled.seek(0)
+    return spooled
+
+
+def _process_avatar(source: BinaryIO) -> bytes:
+    """
+    Resize an uploaded image to a 256x256 JPEG avatar.
+
+    CPU-bound (LANCZOS resampling and JPEG encoding), so callers run it in a
+    worker thread rather than on the event loop.
+    """
+    image = Image.open(source)
+
+    # Let libjpeg scale JPEGs down by 1/2, 1/4 or 1/8 while decoding, keeping
+    # at least 512x512; no-op for other formats
+    image.draft('RGB', (512, 512))
+
+    # Resize to 256x256 (square)
+    image = image.resize((256, 256), Image.Resampling.LANCZOS)
+
+    # Convert to RGB if necessary (handle PNGs with alpha)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode in ('RGBA', 'LA'):
+            background.paste(image, mask=image.split()[-1])
+        else:
+            background.paste(image)
+        image = background
+
+    # Save to bytes
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format='JPEG', quality=90)
+    return img_byte_arr.getvalue()
+
+
+def _delete_old_avatar(s3_key: str) -> None:
+    """
+    Delete a replaced avatar from S3.
+
+    Runs as a background task once the new avatar is saved; old file cleanup
+    is not critical, so failures are only logged.
+    """
+    try:
+        s3_client.delete_object(
+            Bucket=_S3_BUCKET,
+            Key=s3_key,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to delete old avatar: {str(e)}")
 
 
 @router.post("/me/avatar")
 async def upload_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_obj),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -259,16 +383,6 @@ async def upload_avatar(
     - Converted to JPEG format
     - Uploaded to S3
     """
-    # Fetch user object
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(
@@ -276,63 +390,37 @@ async def upload_avatar(
             detail="File must be an image",
         )
 
+    # Read the upload, rejecting oversized files before any image work
+    avatar_file = await _spool_avatar_upload(file)
+
     try:
-        # Read image
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-
-        # Resize to 256x256 (square)
-        image = image.resize((256, 256), Image.Resampling.LANCZOS)
-
-        # Convert to RGB if necessary (handle PNGs with alpha)
-        if image.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            if image.mode in ('RGBA', 'LA'):
-                background.paste(image, mask=image.split()[-1])
-            else:
-                background.paste(image)
-            image = background
-
-        # Save to bytes
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format='JPEG', quality=90)
-        img_byte_arr.seek(0)
+        # Resize and re-encode off the event loop
+        with avatar_file:
+            jpeg_bytes = await asyncio.to_thread(_process_avatar, avatar_file)
 
         # Generate unique filename
-        filename = f"avatars/{user.id}/{uuid.uuid4()}.jpg"
+        filename = f"avatars/{current_user.id}/{uuid.uuid4()}.jpg"
 
         # Upload to S3
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-        )
-
-        s3_client.upload_fileobj(
-            img_byte_arr,
-            settings.aws_s3_bucket,
+        await asyncio.to_thread(
+            s3_client.upload_fileobj,
+            io.BytesIO(jpeg_bytes),
+            _S3_BUCKET,
             filename,
             ExtraArgs={'ContentType': 'image/jpeg'},
         )
 
-        # Delete old avatar from S3 if exists
-        if user.avatar_url:
-            try:
-                s3_client.delete_object(
-                    Bucket=settings.aws_s3_bucket,
-                    Key=user.avatar_url,
-                )
-            except Exception as e:
-                logger.warning(f"Failed to delete old avatar: {str(e)}")
-                # Continue anyway - old file cleanup is not critical
-
         # Update user record
-        user.avatar_url = filename
+        old_avatar_key = current_user.avatar_url
+        current_user.avatar_url = filename
         await db.commit()
-        await db.refresh(user)
+        await db.refresh(current_user)
+
+        # Delete old avatar from S3 after the response is sent
+        if old_avatar_key:
+            background_tasks.add_task(_delete_old_avatar, old_avatar_key)
 
-        logger.info(f"Avatar uploaded successfully for user {user.id}")
+        logger.info(f"Avatar uploaded successfully for user {current_user.id}")
 
         return {
             "message": "Avatar uploaded successfully",
@@ -340,7 +428,7 @@ async def upload_avatar(
         }
 
     except Exception as e:
-        logger.error(f"Failed to upload avatar for user {user.id}: {str(e)}")
+        logger.error(f"Failed to upload avatar for user {current_user.id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload avatar: {str(e)}",
@@ -349,49 +437,29 @@ async def upload_avatar(
 
 @router.get("/me/avatar-url")
 async def get_avatar_url(
-    current_user: dict = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_obj),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get presigned URL for user's avatar.
 
     Returns a temporary URL that can be used to access the avatar image.
-    URL expires in 1 hour.
+    URL is valid for at least 1 hour; with CloudFront it is stable for the
+    day, so browsers can cache the image.
     """
-    # Fetch user object
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    if not user.avatar_url:
+    if not current_user.avatar_url:
         return {"avatar_url": None}
 
     try:
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-        )
-
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': settings.aws_s3_bucket,
-                'Key': user.avatar_url,
-            },
-            ExpiresIn=3600,  # 1 hour
+        presigned_url = generate_image_url(
+            current_user.avatar_url,
+            expiration=3600  # 1 hour
         )
 
         return {"avatar_url": presigned_url}
 
     except Exception as e:
-        logger.error(f"Failed to generate presigned URL for user {user.id}: {str(e)}")
+        logger.error(f"Failed to generate presigned URL for user {current_user.id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate avatar URL",
@@ -400,7 +468,7 @@ async def get_avatar_url(
 
 @router.delete("/me/avatar")
 async def delete_avatar(
-    current_user: dict = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_obj),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -408,44 +476,28 @@ async def delete_avatar(
 
     Removes the avatar from S3 storage and sets avatar_url to None.
     """
-    # Fetch user object
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-
-    if not user.avatar_url:
+    if not current_user.avatar_url:
         return {"message": "No avatar to delete"}
 
     try:
         # Delete from S3
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-        )
-
-        s3_client.delete_object(
-            Bucket=settings.aws_s3_bucket,
-            Key=user.avatar_url,
+        await asyncio.to_thread(
+            s3_client.delete_object,
+            Bucket=_S3_BUCKET,
+            Key=current_user.avatar_url,
         )
 
         # Update database
-        user.avatar_url = None
+        current_user.avatar_url = None
         await db.commit()
-        await db.refresh(user)
+        await db.refresh(current_user)
 
-        logger.info(f"Avatar deleted successfully for user {user.id}")
+        logger.info(f"Avatar deleted successfully for user {current_user.id}")
 
         return {"message": "Avatar deleted successfully"}
 
     except Exception as e:
-        logger.error(f"Failed to delete avatar for user {user.id}: {str(e)}")
+        logger.error(f"Failed to delete avatar for user {current_user.id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete avatar: {str(e)}",
@@ -484,8 +536,7 @@ async def update_user_role(
         )
 
     # Fetch the target user
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
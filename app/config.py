@@ -16,20 +16,24 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./app.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_recycle: int = 1800  # seconds
+    db_statement_cache_size: int = 1024  # per connection (asyncpg only)
 
     # Security
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
-    # CORS
-    allowed_origins: list[str] = [
+    # CORS (a set: CORSMiddleware checks each request's Origin with `in`)
+    allowed_origins: frozenset[str] = frozenset({
         "http://localhost:3000",
         "http://localhost:3001",
         "http://localhost:8000",
         "https://tryseedling.live",
         "https://www.tryseedling.live"
-    ]
+    })
 
     # Frontend URL for redirects
     frontend_url: str = "http://localhost:3000"
@@ -38,6 +42,7 @@ class Settings(BaseSettings):
     stripe_secret_key: str
     stripe_publishable_key: str
     stripe_webhook_secret: str = ""
+    stripe_max_inflight: int = 20  # Max concurrent Stripe API calls per worker
 
     # SendGrid (Email)
     sendgrid_api_key: str = ""
@@ -48,11 +53,19 @@ class Settings(BaseSettings):
     aws_secret_access_key: str
     aws_region: str
     aws_s3_bucket: str
+    s3_upload_max_concurrency: int = 8  # Parallel multipart parts per upload
+
+    # CloudFront (optional signed URLs for cacheable images)
+    cloudfront_domain: str = ""
+    cloudfront_key_pair_id: str = ""
+    cloudfront_private_key: str = ""
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # Read once and shared; modules bind values from it at import
+        frozen = True
 
 
 @lru_cache()
@@ -1,22 +1,42 @@
+import asyncio
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, BotoCoreError
+from botocore.signers import CloudFrontSigner
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from datetime import datetime, timedelta
+from functools import lru_cache
 from fastapi import UploadFile, HTTPException, status
-from typing import Tuple
+from typing import Dict, Tuple
+from urllib.parse import quote
+import hashlib
+import hmac
 import mimetypes
 import os
 import re
+import threading
+import time
 from app.config import get_settings
 
-# Initialize settings and S3 client
+# Initialize settings and the S3 client shared by every module; boto3
+# clients are thread-safe, and building one per request is expensive
 settings = get_settings()
 s3_client = boto3.client(
     's3',
     aws_access_key_id=settings.aws_access_key_id,
     aws_secret_access_key=settings.aws_secret_access_key,
     region_name=settings.aws_region,
-    config=boto3.session.Config(signature_version='s3v4', s3={'addressing_style': 'path'})
+    config=boto3.session.Config(
+        signature_version='s3v4',
+        s3={'addressing_style': 'path'},
+        max_pool_connections=50,
+    )
 )
 
+# Path-style S3 endpoint, matching the client's addressing_style
+_S3_HOST = f"s3.{settings.aws_region}.amazonaws.com"
+
 # Constants
 MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB in bytes
 ALLOWED_VIDEO_TYPES = {
@@ -28,6 +48,28 @@ ALLOWED_VIDEO_TYPES = {
 }
 ALLOWED_EXTENSIONS = {'.mp4', '.mov', '.avi', '.webm', '.mkv'}
 
+# Videos go up as a multipart upload in 8 MiB parts, up to
+# s3_upload_max_concurrency at once. Parts are read by offset from the
+# seekable spooled upload file, so nothing is copied to another temp file
+UPLOAD_PART_SIZE = 8 * 1024 * 1024  # 8MiB
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=UPLOAD_PART_SIZE,
+    multipart_chunksize=UPLOAD_PART_SIZE,
+    max_concurrency=settings.s3_upload_max_concurrency,
+    use_threads=True,
+)
+
+# Presigned URL cache: a URL is reused for at most PRESIGNED_URL_CACHE_MAX_TTL
+# seconds, and never once it has less than PRESIGNED_URL_MIN_REMAINING left
+PRESIGNED_URL_CACHE_MAX_TTL = 3600  # 1 hour
+PRESIGNED_URL_MIN_REMAINING = 600  # 10 minutes
+PRESIGNED_URL_CACHE_MAX_SIZE = 10_000
+
+# (s3_key, expiration) -> (reuse-until, expires-at, url); timestamps are
+# time.monotonic(). Writes take the lock, since callers may be worker threads
+_presigned_url_cache: Dict[Tuple[str, int], Tuple[float, float, str]] = {}
+_presigned_url_cache_lock = threading.Lock()
+
 
 def sanitize_filename(filename: str) -> str:
     """
@@ -148,7 +190,8 @@ def upload_video(file: UploadFile, user_id: int, submission_id: int) -> Tuple[st
                     'submission_id': str(submission_id),
                     'original_filename': sanitize_filename(file.filename) if file.filename else 'video'
                 }
-            }
+            },
+            Config=UPLOAD_TRANSFER_CONFIG,
         )
 
         # Generate S3 URL
@@ -174,6 +217,27 @@ def upload_video(file: UploadFile, user_id: int, submission_id: int) -> Tuple[st
         )
 
 
+async def upload_video_async(file: UploadFile, user_id: int, submission_id: int) -> Tuple[str, str]:
+    """
+    Upload a video file to S3 without blocking the event loop.
+
+    Runs upload_video in a worker thread, so other requests keep being served
+    for the length of the transfer.
+
+    Args:
+        file: The video file to upload
+        user_id: The ID of the user uploading the video
+        submission_id: The ID of the submission
+
+    Returns:
+        Tuple[str, str]: A tuple of (s3_key, s3_url)
+
+    Raises:
+        HTTPException: If upload fails or file is invalid
+    """
+    return await asyncio.to_thread(upload_video, file, user_id, submission_id)
+
+
 def generate_presigned_url(s3_key: str, expiration: int = 3600) -> str:
     """
     Generate a presigned URL for temporary access to a video file.
@@ -189,27 +253,8 @@ def generate_presigned_url(s3_key: str, expiration: int = 3600) -> str:
         HTTPException: If URL generation fails
     """
     try:
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': settings.aws_s3_bucket,
-                'Key': s3_key
-            },
-            ExpiresIn=expiration
-        )
-        return presigned_url
+        return _presign_get_object_url(s3_key, expiration)
 
-    except ClientError as e:
-        error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate presigned URL: {error_code}"
-        )
-    except BotoCoreError as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"AWS service error: {str(e)}"
-        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -217,6 +262,115 @@ def generate_presigned_url(s3_key: str, expiration: int = 3600) -> str:
         )
 
 
+@lru_cache(maxsize=4)
+def _sigv4_signing_key(datestamp: str, region: str) -> bytes:
+    """Derive the SigV4 signing key for S3 on a given day; changes once a day."""
+    key = hmac.new(f"AWS4{settings.aws_secret_access_key}".encode(), datestamp.encode(), hashlib.sha256).digest()
+    key = hmac.new(key, region.encode(), hashlib.sha256).digest()
+    key = hmac.new(key, b"s3", hashlib.sha256).digest()
+    return hmac.new(key, b"aws4_request", hashlib.sha256).digest()
+
+
+def _presign_get_object_url(s3_key: str, expiration: int) -> str:
+    """
+    Build a SigV4 presigned GET URL for an object in the configured bucket.
+
+    Equivalent to s3_client.generate_presigned_url('get_object', ...) with
+    the client's path-style addressing, but the daily signing key is cached
+    and the canonical request is a fixed template, so a URL costs one SHA-256
+    and one HMAC instead of a full botocore request-signing pass.
+    """
+    amz_date = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    datestamp = amz_date[:8]
+    scope = f"{datestamp}/{settings.aws_region}/s3/aws4_request"
+    path = f"/{settings.aws_s3_bucket}/{quote(s3_key, safe='/~')}"
+
+    # Already in canonical (sorted, encoded) order
+    query = (
+        "X-Amz-Algorithm=AWS4-HMAC-SHA256"
+        f"&X-Amz-Credential={quote(f'{settings.aws_access_key_id}/{scope}', safe='')}"
+        f"&X-Amz-Date={amz_date}"
+        f"&X-Amz-Expires={expiration}"
+        "&X-Amz-SignedHeaders=host"
+    )
+    canonical_request = f"GET\n{path}\n{query}\nhost:{_S3_HOST}\n\nhost\nUNSIGNED-PAYLOAD"
+    string_to_sign = (
+        f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+        f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+    )
+    signature = hmac.new(
+        _sigv4_signing_key(datestamp, settings.aws_region),
+        string_to_sign.encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+    return f"https://{_S3_HOST}{path}?{query}&X-Amz-Signature={signature}"
+
+
+def get_cached_presigned_url(s3_key: str, expiration: int = 3600) -> str:
+    """
+    Return a presigned URL for s3_key, reusing a recently signed one.
+
+    Repeated listings of the same keys then cost a dict lookup instead of a
+    SigV4 signature each, and browsers see a stable URL they can cache.
+    Cached URLs always have at least PRESIGNED_URL_MIN_REMAINING seconds of
+    validity left. The cache is per worker process.
+
+    Args:
+        s3_key: The S3 key of the file
+        expiration: URL expiration time in seconds (default: 3600 = 1 hour)
+
+    Returns:
+        str: The presigned URL
+
+    Raises:
+        HTTPException: If URL generation fails
+    """
+    return get_cached_presigned_url_with_expiry(s3_key, expiration)[0]
+
+
+def get_cached_presigned_url_with_expiry(s3_key: str, expiration: int = 3600) -> Tuple[str, int]:
+    """
+    Like get_cached_presigned_url, but also return how long the URL is valid.
+
+    For endpoints that report an expiry to the client: a cached URL has less
+    than `expiration` seconds left.
+
+    Args:
+        s3_key: The S3 key of the file
+        expiration: URL expiration time in seconds (default: 3600 = 1 hour)
+
+    Returns:
+        Tuple[str, int]: The presigned URL and its remaining lifetime in seconds
+
+    Raises:
+        HTTPException: If URL generation fails
+    """
+    ttl = min(PRESIGNED_URL_CACHE_MAX_TTL, expiration - PRESIGNED_URL_MIN_REMAINING)
+    if ttl <= 0:
+        return generate_presigned_url(s3_key, expiration=expiration), expiration
+
+    cache_key = (s3_key, expiration)
+    now = time.monotonic()
+    entry = _presigned_url_cache.get(cache_key)
+    if entry is not None and entry[0] > now:
+        return entry[2], int(entry[1] - now)
+
+    url = generate_presigned_url(s3_key, expiration=expiration)
+
+    with _presigned_url_cache_lock:
+        if len(_presigned_url_cache) >= PRESIGNED_URL_CACHE_MAX_SIZE:
+            # Drop expired entries; if still full, drop the oldest insertion
+            for key in [k for k, (reuse_until, _, _) in _presigned_url_cache.items() if reuse_until <= now]:
+                _presigned_url_cache.pop(key, None)
+            if len(_presigned_url_cache) >= PRESIGNED_URL_CACHE_MAX_SIZE:
+                _presigned_url_cache.pop(next(iter(_presigned_url_cache)), None)
+
+        _presigned_url_cache[cache_key] = (now + ttl, now + expiration, url)
+
+    return url, expiration
+
+
 def delete_file(s3_key: str) -> None:
     """
     Delete a file from S3.
@@ -251,3 +405,89 @@ def delete_file(s3_key: str) -> None:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error during deletion: {str(e)}"
         )
+
+
+async def delete_file_async(s3_key: str) -> None:
+    """
+    Delete a file from S3 without blocking the event loop.
+
+    Runs delete_file in a worker thread.
+
+    Args:
+        s3_key: The S3 key of the file to delete
+
+    Raises:
+        HTTPException: If deletion fails
+    """
+    await asyncio.to_thread(delete_file, s3_key)
+
+
+@lru_cache(maxsize=1)
+def _get_cloudfront_signer() -> CloudFrontSigner:
+    """Build the CloudFront signer once, loading the RSA private key from settings."""
+    private_key = serialization.load_pem_private_key(
+        settings.cloudfront_private_key.replace("\\n", "\n").encode(),
+        password=None,
+    )
+
+    def rsa_signer(message: bytes) -> bytes:
+        return private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    return CloudFrontSigner(settings.cloudfront_key_pair_id, rsa_signer)
+
+
+@lru_cache(maxsize=10_000)
+def generate_cloudfront_signed_url(s3_key: str, expires_at: datetime) -> str:
+    """
+    Generate a CloudFront signed URL for a file.
+
+    Signing is deterministic, so results are memoized: with the day-pinned
+    expiries from generate_image_url, each key is RSA-signed once a day.
+
+    Args:
+        s3_key: The S3 key of the file (served from the CloudFront origin)
+        expires_at: When the signed URL stops being valid
+
+    Returns:
+        str: The signed CloudFront URL
+
+    Raises:
+        HTTPException: If URL generation fails
+    """
+    try:
+        url = f"https://{settings.cloudfront_domain}/{s3_key}"
+        return _get_cloudfront_signer().generate_presigned_url(url, date_less_than=expires_at)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unexpected error generating CloudFront URL: {str(e)}"
+        )
+
+
+def generate_image_url(s3_key: str, expiration: int = 3600) -> str:
+    """
+    Generate a browser-cacheable URL for an image.
+
+    When CloudFront is configured, the expiry is pinned to a day boundary so
+    every request on the same day gets an identical URL (and browsers can reuse
+    their cached copy). The URL stays valid for at least `expiration` seconds.
+    Falls back to a (cached) S3 presigned URL otherwise.
+
+    Args:
+        s3_key: The S3 key of the image
+        expiration: Minimum URL lifetime in seconds (default: 3600 = 1 hour)
+
+    Returns:
+        str: The image URL
+
+    Raises:
+        HTTPException: If URL generation fails
+    """
+    if not (settings.cloudfront_domain and settings.cloudfront_key_pair_id and settings.cloudfront_private_key):
+        return get_cached_presigned_url(s3_key, expiration=expiration)
+
+    start_of_day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    expires_at = start_of_day + timedelta(days=1, seconds=expiration)
+
+    return generate_cloudfront_signed_url(s3_key, expires_at)
@@ -4,7 +4,6 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import get_settings
 from app.database import get_db
@@ -85,8 +84,9 @@ async def get_current_user_obj(
     # Import here to avoid circular import
     from app.models.user import User
 
-    result = await db.execute(select(User).where(User.id == int(current_user["user_id"])))
-    user = result.scalar_one_or_none()
+    # Primary-key get: served from the session's identity map when the user
+    # is already loaded, otherwise one cached-statement SELECT
+    user = await db.get(User, int(current_user["user_id"]))
 
     if not user:
         raise HTTPException(
@@ -0,0 +1,60 @@
+"""
+Short-lived in-process cache for Stripe Connect account status.
+
+Avoids a Stripe round-trip on every /connect-accounts/status poll. Entries
+expire after ACCOUNT_CACHE_TTL_SECONDS and are invalidated explicitly when
+Stripe sends an account.updated webhook. The cache is per worker process,
+so the TTL bounds how stale another worker's copy can be.
+"""
+import time
+from typing import Dict, Optional, Tuple
+import stripe
+from app.core.stripe_service import call_stripe
+
+ACCOUNT_CACHE_TTL_SECONDS = 120
+
+# account_id -> (expires_at monotonic timestamp, status fields)
+_account_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+def get_cached_account(account_id: str) -> Optional[dict]:
+    """Return cached status fields for a Connect account, or None if missing/expired."""
+    entry = _account_cache.get(account_id)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at <= time.monotonic():
+        _account_cache.pop(account_id, None)
+        return None
+    return data
+
+
+def set_cached_account(account_id: str, data: dict) -> None:
+    """Cache status fields for a Connect account."""
+    _account_cache[account_id] = (time.monotonic() + ACCOUNT_CACHE_TTL_SECONDS, data)
+
+
+def invalidate_account(account_id: str) -> None:
+    """Drop a Connect account from the cache (e.g. on account.updated)."""
+    _account_cache.pop(account_id, None)
+
+
+async def retrieve_account_status(account_id: str) -> dict:
+    """
+    Get charges_enabled, payouts_enabled and details_submitted for a Connect account.
+
+    Served from cache when fresh; otherwise retrieved from Stripe and cached.
+    Raises stripe.error.StripeError on Stripe failures (after retrying transient ones).
+    """
+    data = get_cached_account(account_id)
+    if data is not None:
+        return data
+
+    account = await call_stripe(stripe.Account.retrieve, account_id)
+    data = {
+        "charges_enabled": bool(account.charges_enabled),
+        "payouts_enabled": bool(account.payouts_enabled),
+        "details_submitted": bool(account.details_submitted),
+    }
+    set_cached_account(account_id, data)
+    return data
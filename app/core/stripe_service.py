@@ -1,5 +1,11 @@
+import asyncio
+import hashlib
+import hmac
+import random
+import time
+import uuid
 import stripe
-from typing import Optional
+from typing import Any, Callable, Optional
 from fastapi import HTTPException, status
 from app.config import get_settings
 
@@ -7,11 +13,112 @@ from app.config import get_settings
 settings = get_settings()
 stripe.api_key = settings.stripe_secret_key
 
+# Retry policy for transient Stripe failures (rate limits, network errors)
+STRIPE_MAX_ATTEMPTS = 3
+STRIPE_BACKOFF_INITIAL = 0.2  # seconds
+STRIPE_BACKOFF_MAX = 2.0  # seconds
+STRIPE_RETRY_AFTER_SECONDS = 2
+
+# Maximum age of a webhook signature timestamp (same default as the Stripe SDK)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+# Caps concurrent outbound Stripe calls so bursts queue here instead of hitting 429s
+_stripe_semaphore = asyncio.Semaphore(settings.stripe_max_inflight)
+
+
+async def call_stripe(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Call a blocking Stripe SDK function in a worker thread, retrying transient errors.
+
+    At most settings.stripe_max_inflight calls run concurrently per process;
+    the semaphore is released while backing off between attempts.
+
+    RateLimitError and APIConnectionError are retried with jittered exponential
+    backoff, up to STRIPE_MAX_ATTEMPTS attempts in total. The last error is
+    re-raised if every attempt fails; other Stripe errors propagate immediately.
+
+    A connection error can arrive after Stripe has already carried out the
+    request, so calls that create objects must pass an idempotency_key
+    (see new_idempotency_key). Every attempt sends the same kwargs, so a retry
+    replays the first result instead of creating a duplicate.
+    """
+    for attempt in range(STRIPE_MAX_ATTEMPTS):
+        try:
+            async with _stripe_semaphore:
+                return await asyncio.to_thread(fn, *args, **kwargs)
+        except (stripe.error.RateLimitError, stripe.error.APIConnectionError):
+            if attempt == STRIPE_MAX_ATTEMPTS - 1:
+                raise
+            delay = min(STRIPE_BACKOFF_MAX, STRIPE_BACKOFF_INITIAL * 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+
+def new_idempotency_key() -> str:
+    """Return a fresh idempotency key for one logical Stripe create call."""
+    return str(uuid.uuid4())
+
+
+def stripe_rate_limited_exception() -> HTTPException:
+    """503 response for when Stripe keeps rate limiting us after retries."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Payment service is busy. Please try again shortly.",
+        headers={"Retry-After": str(STRIPE_RETRY_AFTER_SECONDS)},
+    )
+
+
+def verify_webhook_signature(
+    payload: bytes,
+    sig_header: str,
+    secret: bytes,
+    tolerance: int = WEBHOOK_TOLERANCE_SECONDS,
+) -> None:
+    """
+    Verify a Stripe-Signature header against the raw webhook body.
+
+    The header looks like "t=<timestamp>,v1=<sig>[,v1=<sig>...]"; each v1 is
+    the hex HMAC-SHA256 of "<timestamp>.<payload>" keyed with the endpoint
+    secret. Several v1 entries are present while a secret is being rolled.
+
+    Raises:
+        stripe.error.SignatureVerificationError: If the header is malformed,
+            the timestamp is outside the tolerance, or no signature matches
+    """
+    timestamp = None
+    signatures = []
+    for item in sig_header.split(","):
+        key, _, value = item.strip().partition("=")
+        if key == "t":
+            timestamp = value
+        elif key == "v1":
+            signatures.append(value.encode())
+
+    if timestamp is None or not timestamp.isdigit() or not signatures:
+        raise stripe.error.SignatureVerificationError(
+            "Unable to extract timestamp and signatures from header", sig_header, payload
+        )
+
+    if abs(time.time() - int(timestamp)) > tolerance:
+        raise stripe.error.SignatureVerificationError(
+            "Timestamp outside the tolerance zone", sig_header, payload
+        )
+
+    expected = hmac.new(
+        secret, timestamp.encode() + b"." + payload, hashlib.sha256
+    ).hexdigest().encode()
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        raise stripe.error.SignatureVerificationError(
+            "No signatures found matching the expected signature for payload",
+            sig_header,
+            payload,
+        )
+
 
 def create_payment_intent(
     amount: int,
     currency: str = "usd",
     metadata: Optional[dict] = None,
+    idempotency_key: Optional[str] = None,
 ) -> stripe.PaymentIntent:
     """
     Create a Stripe PaymentIntent.
@@ -20,6 +127,7 @@ def create_payment_intent(
         amount: Amount in cents (e.g., 1000 for $10.00)
         currency: Three-letter ISO currency code (default: "usd")
         metadata: Optional metadata to attach to the payment intent
+        idempotency_key: Optional key that makes retries of this call safe
 
     Returns:
         stripe.PaymentIntent: The created payment intent object
@@ -34,6 +142,7 @@ def create_payment_intent(
             metadata=metadata or {},
             # Automatic payment methods for better UX
             automatic_payment_methods={"enabled": True, "allow_redirects": "never"},
+            idempotency_key=idempotency_key,
         )
         return payment_intent
 
@@ -9,11 +9,30 @@ database_url = settings.database_url
 if database_url.startswith("postgresql://"):
     database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+# Connection pool sizing (not applicable to SQLite's file-based pool)
+engine_kwargs = {}
+if not database_url.startswith("sqlite"):
+    engine_kwargs.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
+# asyncpg: keep prepared statements per connection and skip JIT, which only
+# adds planning time for the short OLTP queries this API runs
+if database_url.startswith("postgresql+asyncpg"):
+    engine_kwargs["connect_args"] = {
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "server_settings": {"jit": "off"},
+    }
+
 # Create async engine
 engine = create_async_engine(
     database_url,
     echo=settings.debug,
     future=True,
+    **engine_kwargs,
 )
 
 # Create async session factory
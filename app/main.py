@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
 from app.database import init_db
@@ -22,27 +23,30 @@ def create_application() -> FastAPI:
         version=settings.version,
         debug=settings.debug,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS for file uploads and API requests
     application.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.allowed_origins,  # ["http://localhost:3000", ...]
+        allow_origins=settings.allowed_origins,  # frozenset({"http://localhost:3000", ...})
         allow_credentials=True,
         allow_methods=["*"],  # Allow all methods including OPTIONS, POST
         allow_headers=["*"],  # Allow all headers including Content-Type, Authorization
-        expose_headers=["*"],  # Expose all response headers
+        # Browsers read "*" literally on credentialed requests, so headers the
+        # frontend must read are also listed by name
+        expose_headers=["*", "X-Has-Next"],
     )
 
     # Log CORS configuration (debug mode only)
     if settings.debug:
         print("=" * 80)
         print("CORS Configuration:")
-        print(f"  Allowed Origins: {settings.allowed_origins}")
+        print(f"  Allowed Origins: {sorted(settings.allowed_origins)}")
         print(f"  Allow Credentials: True")
         print(f"  Allow Methods: *")
         print(f"  Allow Headers: *")
-        print(f"  Expose Headers: *")
+        print(f"  Expose Headers: *, X-Has-Next")
         print("=" * 80)
 
     application.include_router(health.router, tags=["Health"])
@@ -5,6 +5,7 @@ from app.models.payment import Payment, PaymentType, PaymentStatus
 from app.models.judge_assignment import JudgeAssignment
 from app.models.user_bank_account import UserBankAccount
 from app.models.password_reset_token import PasswordResetToken
+from app.models.stripe_event import StripeProcessedEvent
 
 __all__ = [
     "User",
@@ -18,4 +19,5 @@ __all__ = [
     "JudgeAssignment",
     "UserBankAccount",
     "PasswordResetToken",
+    "StripeProcessedEvent",
 ]
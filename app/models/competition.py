@@ -2,9 +2,10 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 import enum
-from sqlalchemy import String, Text, Integer, Numeric, DateTime, Enum, JSON, ForeignKey, Index
+from sqlalchemy import String, Text, Integer, Numeric, DateTime, Enum, JSON, ForeignKey, Index, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
+from app.models.types import TZNaiveDateTime
 
 
 class CompetitionStatus(str, enum.Enum):
@@ -35,16 +36,24 @@ class Competition(Base):
 
     # Financial fields
     entry_fee: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
-    prize_pool: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    prize_pool: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False, server_default='0')
     platform_fee_percentage: Mapped[Decimal] = mapped_column(Numeric(5, 2), nullable=False)
 
+    # Integer-cent forms of the fee fields, generated by the database
+    entry_fee_cents: Mapped[int] = mapped_column(
+        Integer, Computed("CAST(entry_fee * 100 AS INTEGER)", persisted=True)
+    )
+    platform_fee_cents: Mapped[int] = mapped_column(
+        Integer, Computed("CAST(ROUND(entry_fee * platform_fee_percentage) AS INTEGER)", persisted=True)
+    )
+
     # Entry management
     max_entries: Mapped[int] = mapped_column(Integer, nullable=False)
     current_entries: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # Dates
-    deadline: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    open_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    deadline: Mapped[datetime] = mapped_column(TZNaiveDateTime, nullable=False, index=True)
+    open_date: Mapped[datetime] = mapped_column(TZNaiveDateTime, nullable=False, index=True)
 
     # Judging
     judging_sla_days: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -66,7 +75,7 @@ class Competition(Base):
     created_by: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
 
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(TZNaiveDateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 import enum
-from sqlalchemy import String, Numeric, DateTime, Enum, ForeignKey, Index
+from sqlalchemy import String, Numeric, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -54,8 +54,11 @@ class Payment(Base):
     )
 
     # Stripe integration fields
-    stripe_payment_intent_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
-    stripe_transfer_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
+    stripe_payment_intent_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    stripe_transfer_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # PaymentIntent client_secret (already sent to the browser), so a retried
+    # checkout can resume without another Stripe round trip
+    stripe_client_secret: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Processing timestamp
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -75,6 +78,23 @@ class Payment(Base):
         Index("ix_payments_user_status", "user_id", "status"),
         Index("ix_payments_competition_type", "competition_id", "type"),
         Index("ix_payments_status_type", "status", "type"),
+        Index(
+            "ix_payments_prize_payout_submission",
+            "submission_id",
+            postgresql_where=text("type = 'prize_payout'"),
+        ),
+        Index(
+            "uq_payments_stripe_payment_intent_id",
+            "stripe_payment_intent_id",
+            unique=True,
+            postgresql_where=text("stripe_payment_intent_id IS NOT NULL"),
+        ),
+        Index(
+            "uq_payments_stripe_transfer_id",
+            "stripe_transfer_id",
+            unique=True,
+            postgresql_where=text("stripe_transfer_id IS NOT NULL"),
+        ),
     )
 
     def __repr__(self) -> str:
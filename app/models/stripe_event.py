@@ -0,0 +1,25 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from app.models.types import utc_now
+
+
+class StripeProcessedEvent(Base):
+    """Stripe webhook event that has been processed (for idempotency)."""
+
+    __tablename__ = "stripe_processed_events"
+
+    # Stripe event ID (evt_...)
+    event_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # Timestamps
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=utc_now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<StripeProcessedEvent(event_id={self.event_id}, event_type={self.event_type})>"
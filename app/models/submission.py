@@ -2,7 +2,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 import enum
-from sqlalchemy import String, Text, Boolean, Numeric, DateTime, Enum, JSON, ForeignKey, Index
+from sqlalchemy import String, Text, Boolean, Integer, Float, Numeric, DateTime, Enum, JSON, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship, attributes
 from app.database import Base
 
@@ -59,6 +59,11 @@ class Submission(Base):
     final_score: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
     placement: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
 
+    # Denormalized judging stats for leaderboards (see refresh_judging_counts)
+    num_judges_assigned: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    num_judges_completed: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    human_scores_average: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
     # Feedback
     judge_feedback: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
 
@@ -84,7 +89,17 @@ class Submission(Base):
     __table_args__ = (
         Index("ix_submissions_competition_status", "competition_id", "status"),
         Index("ix_submissions_user_competition", "user_id", "competition_id"),
+        Index(
+            "uq_submissions_user_competition_active",
+            "user_id",
+            "competition_id",
+            unique=True,
+            postgresql_where=text(
+                "status IN ('draft', 'pending_payment', 'submitted', 'under_review', 'winner')"
+            ),
+        ),
         Index("ix_submissions_status_final_score", "status", "final_score"),
+        Index("ix_submissions_competition_final_score", "competition_id", text("final_score DESC NULLS LAST")),
     )
 
     def add_judge_score(
@@ -171,6 +186,7 @@ class Submission(Base):
             self.human_scores["average"] = total_overall / len(judges_list)
         else:
             self.human_scores["average"] = 0.0
+        self.human_scores_average = self.human_scores["average"]
 
         # Update judge_feedback as an array
         feedback_entry = {
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import DateTime, func
+from sqlalchemy.types import TypeDecorator
+
+
+class TZNaiveDateTime(TypeDecorator):
+    """
+    DateTime column type that normalizes aware datetimes to naive UTC.
+
+    Columns are stored as TIMESTAMP WITHOUT TIME ZONE in UTC, so
+    timezone-aware values coming from API payloads are converted to UTC and
+    made naive at bind time.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[datetime], dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+def utc_now():
+    """
+    SQL expression for the current UTC time as a naive timestamp.
+
+    Lets the database stamp TIMESTAMP WITHOUT TIME ZONE columns in the same
+    statement, matching the naive-UTC convention of datetime.utcnow().
+    """
+    return func.timezone("utc", func.now())
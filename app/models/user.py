@@ -1,7 +1,7 @@
 from datetime import datetime
 import enum
 from typing import Optional
-from sqlalchemy import String, Boolean, DateTime, Enum
+from sqlalchemy import String, Boolean, DateTime, Enum, CheckConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -80,6 +80,13 @@ class User(Base):
         cascade="all, delete-orphan"
     )
 
+    # Emails and usernames are stored lowercase, so case-insensitive lookups
+    # are plain equality on the unique indexes
+    __table_args__ = (
+        CheckConstraint("email = lower(email)", name="ck_users_email_lowercase"),
+        CheckConstraint("username = lower(username)", name="ck_users_username_lowercase"),
+    )
+
     @property
     def is_superuser(self) -> bool:
         """Backward compatibility property. Returns True if user has ADMIN role."""
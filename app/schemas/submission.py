@@ -7,6 +7,17 @@ from app.models.submission import SubmissionStatus
 from app.schemas.competition import UserInfo
 
 
+def _construct_from_attributes(model_cls: type[BaseModel], obj: Any, **overrides: Any) -> Any:
+    """model_construct() from an object's attributes, for trusted ORM rows."""
+    values = {
+        name: getattr(obj, name)
+        for name in model_cls.model_fields
+        if name not in overrides
+    }
+    values.update(overrides)
+    return model_cls.model_construct(**values)
+
+
 class CompetitionInfo(BaseModel):
     """Simplified competition info for nested responses."""
 
@@ -68,6 +79,27 @@ class SubmissionResponse(SubmissionBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @classmethod
+    def from_orm_trusted(
+        cls,
+        submission: Any,
+        payment_intent_client_secret: Optional[str] = None,
+    ) -> SubmissionResponse:
+        """
+        Build a response from a loaded Submission without running validation.
+
+        Only for ORM rows (with user and competition loaded), whose values are
+        already typed by the database; client input still goes through
+        model_validate.
+        """
+        return _construct_from_attributes(
+            cls,
+            submission,
+            user=_construct_from_attributes(UserInfo, submission.user),
+            competition=_construct_from_attributes(CompetitionInfo, submission.competition),
+            payment_intent_client_secret=payment_intent_client_secret,
+        )
+
 
 class SubmissionListResponse(BaseModel):
     """Simplified schema for submission listings without scores/feedback."""
@@ -2,12 +2,16 @@ from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from app.config import get_settings
 from decimal import Decimal
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# SendGridAPIClient.send is a blocking HTTP call, so the helpers run it in a
+# worker thread; the event loop stays free and sends can overlap
+
 
 async def send_password_reset_email(to_email: str, reset_token: str, username: str):
     """Send password reset email with token link"""
@@ -50,7 +54,7 @@ async def send_password_reset_email(to_email: str, reset_token: str, username: s
         )
 
         sg = SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
+        response = await asyncio.to_thread(sg.send, message)
 
         logger.info(f"Password reset email sent to {to_email}, status: {response.status_code}")
         return True
@@ -108,7 +112,7 @@ async def send_email_change_notification(old_email: str, new_email: str, usernam
         )
 
         sg = SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
+        response = await asyncio.to_thread(sg.send, message)
 
         logger.info(f"Email change notification sent to {old_email}, status: {response.status_code}")
         return True
@@ -232,7 +236,7 @@ async def send_winner_notification(
             html_content=html_content
         )
         sg = SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
+        response = await asyncio.to_thread(sg.send, message)
         logger.info(f"Winner notification sent to {to_email}, status: {response.status_code}")
         return True
     except Exception as e:
@@ -325,7 +329,7 @@ async def send_participant_notification(
             html_content=html_content
         )
         sg = SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
+        response = await asyncio.to_thread(sg.send, message)
         logger.info(f"Participant notification sent to {to_email}, status: {response.status_code}")
         return True
     except Exception as e:
@@ -459,7 +463,7 @@ async def send_competition_announcement(
             html_content=html_content
         )
         sg = SendGridAPIClient(settings.sendgrid_api_key)
-        response = sg.send(message)
+        response = await asyncio.to_thread(sg.send, message)
         logger.info(f"Competition announcement sent to {to_email}, status: {response.status_code}")
         return True
     except Exception as e:
@@ -0,0 +1,34 @@
+from typing import Iterable
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.submission import Submission
+from app.models.judge_assignment import JudgeAssignment
+
+
+async def refresh_judging_counts(db: AsyncSession, submission_ids: Iterable[int]) -> None:
+    """
+    Recompute the denormalized judge counters on the given submissions.
+
+    Must be called after judge assignments are created, deleted or completed
+    (and flushed), in the same transaction, so leaderboards can read
+    num_judges_assigned / num_judges_completed without joining judge_assignments.
+    """
+    submission_ids = list(submission_ids)
+    if not submission_ids:
+        return
+
+    assigned = (
+        select(func.count(JudgeAssignment.id))
+        .where(JudgeAssignment.submission_id == Submission.id)
+        .scalar_subquery()
+    )
+    completed = (
+        select(func.count(JudgeAssignment.completed_at))
+        .where(JudgeAssignment.submission_id == Submission.id)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(Submission)
+        .where(Submission.id.in_(submission_ids))
+        .values(num_judges_assigned=assigned, num_judges_completed=completed)
+    )
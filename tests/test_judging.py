@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.judge_assignment import JudgeAssignment
+from app.models.submission import Submission, SubmissionStatus
+from app.models.user import UserRole
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_judge_assignments_include_judge_score(db, client, make_user, make_competition, auth_headers):
+    """GET /judging/assignments runs its jsonpath score query on PostgreSQL."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    judge = await make_user("judge", role=UserRole.JUDGE)
+    other_judge = await make_user("otherjudge", role=UserRole.JUDGE)
+    founder = await make_user("founder")
+    competition = await make_competition(admin.id)
+
+    scored = Submission(
+        competition_id=competition.id,
+        user_id=founder.id,
+        title="Scored",
+        description="Scored by both judges",
+        status=SubmissionStatus.UNDER_REVIEW,
+        human_scores={
+            "judges": [
+                {"judge_id": other_judge.id, "overall": 4.0},
+                {"judge_id": judge.id, "overall": 7.75},
+            ],
+        },
+    )
+    db.add(scored)
+    await db.flush()
+    db.add(JudgeAssignment(
+        judge_id=judge.id,
+        submission_id=scored.id,
+        assigned_by=admin.id,
+        completed_at=datetime.utcnow(),
+    ))
+    await db.commit()
+
+    response = await client.get("/api/v1/judging/assignments", headers=auth_headers(judge))
+
+    assert response.status_code == 200
+    [assignment] = response.json()
+    assert assignment["competition"]["id"] == competition.id
+    assert assignment["completed"] == 1
+    assert assignment["total"] == 1
+    [submission] = assignment["submissions"]
+    assert submission["id"] == scored.id
+    assert submission["has_scored"] is True
+    assert submission["judge_score"] == 7.75
+
+
+async def test_judge_assignments_unscored_submission(db, client, make_user, make_competition, auth_headers):
+    """A submission the judge hasn't scored yet has no judge_score."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    judge = await make_user("judge", role=UserRole.JUDGE)
+    founder = await make_user("founder")
+    competition = await make_competition(admin.id)
+
+    unscored = Submission(
+        competition_id=competition.id,
+        user_id=founder.id,
+        title="Unscored",
+        description="Not scored yet",
+        status=SubmissionStatus.UNDER_REVIEW,
+    )
+    db.add(unscored)
+    await db.flush()
+    db.add(JudgeAssignment(judge_id=judge.id, submission_id=unscored.id, assigned_by=admin.id))
+    await db.commit()
+
+    response = await client.get("/api/v1/judging/assignments", headers=auth_headers(judge))
+
+    assert response.status_code == 200
+    [assignment] = response.json()
+    assert assignment["completed"] == 0
+    [submission] = assignment["submissions"]
+    assert submission["has_scored"] is False
+    assert submission["judge_score"] is None
+
+
+async def test_judge_assignments_keep_assignment_order(db, client, make_user, make_competition, auth_headers):
+    """Competitions and submissions come back in the order they were assigned."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    judge = await make_user("judge", role=UserRole.JUDGE)
+    founders = [await make_user(f"founder{i}") for i in range(3)]
+    first_created = await make_competition(admin.id)
+    second_created = await make_competition(admin.id)
+
+    # Assign the newer competition first, then both of the older one's entries
+    submissions = []
+    for founder, competition in zip(founders, (second_created, first_created, first_created)):
+        submission = Submission(
+            competition_id=competition.id,
+            user_id=founder.id,
+            title=f"Entry by {founder.username}",
+            description="An entry",
+            status=SubmissionStatus.UNDER_REVIEW,
+        )
+        db.add(submission)
+        await db.flush()
+        db.add(JudgeAssignment(judge_id=judge.id, submission_id=submission.id, assigned_by=admin.id))
+        await db.flush()
+        submissions.append(submission)
+    await db.commit()
+
+    response = await client.get("/api/v1/judging/assignments", headers=auth_headers(judge))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [a["competition"]["id"] for a in body] == [second_created.id, first_created.id]
+    assert [s["id"] for s in body[1]["submissions"]] == [submissions[1].id, submissions[2].id]
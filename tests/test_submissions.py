@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.submission import Submission, SubmissionStatus
+from app.models.user import UserRole
+
+pytestmark = pytest.mark.asyncio
+
+
+def _submission_payload(competition_id: int, status: str = "draft") -> dict:
+    return {
+        "competition_id": competition_id,
+        "title": "My Startup",
+        "description": "What we are building",
+        "status": status,
+    }
+
+
+async def test_create_duplicate_draft_is_rejected(client, make_user, make_competition, auth_headers):
+    """A second draft for the same competition hits the unique index and gets a 400."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    founder = await make_user("founder")
+    competition = await make_competition(admin.id)
+
+    first = await client.post(
+        "/api/v1/submissions/",
+        json=_submission_payload(competition.id),
+        headers=auth_headers(founder),
+    )
+    assert first.status_code == 201
+
+    second = await client.post(
+        "/api/v1/submissions/",
+        json=_submission_payload(competition.id),
+        headers=auth_headers(founder),
+    )
+    assert second.status_code == 400
+    assert second.json()["detail"] == "You already have a submission for this competition"
+
+
+async def test_submit_while_draft_exists_is_rejected(client, make_user, make_competition, auth_headers):
+    """Submitting over an existing draft with no entry fee payment gets a 400."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    founder = await make_user("founder")
+    competition = await make_competition(admin.id)
+
+    draft = await client.post(
+        "/api/v1/submissions/",
+        json=_submission_payload(competition.id),
+        headers=auth_headers(founder),
+    )
+    assert draft.status_code == 201
+
+    response = await client.post(
+        "/api/v1/submissions/",
+        json=_submission_payload(competition.id, status="submitted"),
+        headers=auth_headers(founder),
+    )
+    assert response.status_code == 400
+    assert f"(ID: {draft.json()['id']})" in response.json()["detail"]
+
+
+async def test_submit_resumes_pending_payment(db, client, make_user, make_competition, auth_headers):
+    """Submitting again while the entry fee is pending returns the existing entry."""
+    admin = await make_user("admin", role=UserRole.ADMIN)
+    founder = await make_user("founder")
+    competition = await make_competition(admin.id)
+
+    submission = Submission(
+        competition_id=competition.id,
+        user_id=founder.id,
+        title="My Startup",
+        description="What we are building",
+        status=SubmissionStatus.PENDING_PAYMENT,
+    )
+    db.add(submission)
+    await db.flush()
+    db.add(Payment(
+        user_id=founder.id,
+        competition_id=competition.id,
+        submission_id=submission.id,
+        amount=Decimal("10.00"),
+        type=PaymentType.ENTRY_FEE,
+        status=PaymentStatus.PENDING,
+        stripe_payment_intent_id="pi_test",
+        stripe_client_secret="pi_test_secret",
+    ))
+    await db.commit()
+
+    response = await client.post(
+        "/api/v1/submissions/",
+        json=_submission_payload(competition.id, status="submitted"),
+        headers=auth_headers(founder),
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["id"] == submission.id
+    assert body["status"] == SubmissionStatus.PENDING_PAYMENT.value
+    assert body["payment_intent_client_secret"] == "pi_test_secret"